@@ -0,0 +1,5 @@
+-- Account the replica connects with. Not written to the binary log, so it is not replicated.
+SET sql_log_bin = 0;
+CREATE USER IF NOT EXISTS 'repl'@'%' IDENTIFIED BY 'repl';
+GRANT REPLICATION SLAVE ON *.* TO 'repl'@'%';
+SET sql_log_bin = 1;
@@ -0,0 +1,10 @@
+-- Follow the primary from the start of its binary log, so sites and users created on it later
+-- (bench new-site) show up here as well.
+CHANGE MASTER TO
+	MASTER_HOST = 'primary',
+	MASTER_PORT = 3306,
+	MASTER_USER = 'repl',
+	MASTER_PASSWORD = 'repl',
+	MASTER_USE_GTID = slave_pos,
+	MASTER_CONNECT_RETRY = 5;
+START SLAVE;
@@ -0,0 +1,70 @@
+import frappe
+from frappe.utils import cint
+
+from timesheet_management_system.utils.cache import clear_now_and_after_commit
+from timesheet_management_system.utils.metrics import increment
+from timesheet_management_system.utils.replica import primary
+
+CACHE_KEY = "telegram_command_cache"
+VERSIONS_KEY = "telegram_command_cache_versions"
+DEFAULT_TTL = 300
+
+
+def get_ttl():
+	ttl = frappe.conf.get("telegram_command_cache_ttl")
+	return DEFAULT_TTL if ttl is None else cint(ttl)
+
+
+def get_versions(scopes):
+	# versions are raw redis counters, so read them past RedisWrapper's unpickling helpers
+	pipeline = frappe.cache.pipeline()
+	pipeline.hmget(frappe.cache.make_key(VERSIONS_KEY), scopes)
+	(versions,) = pipeline.execute()
+	return ".".join(frappe.safe_decode(v) if v else "0" for v in versions)
+
+
+def cached_render(command, args, week, scopes, render):
+	"""Serve a rendered bot reply from cache, keyed by the current version of every scope it depends on."""
+	ttl = get_ttl()
+	if not ttl:
+		return render()
+
+	key = f"{CACHE_KEY}|{command}|{args}|{week}|{get_versions(scopes)}"
+	msg = frappe.cache.get_value(key)
+	if msg is not None:
+		increment("bot.command_cache.hit")
+		return msg
+
+	increment("bot.command_cache.miss")
+	with primary():
+		msg = render()
+	frappe.cache.set_value(key, msg, expires_in_sec=ttl)
+	return msg
+
+
+def bump(*scopes):
+	def bump_now():
+		pipeline = frappe.cache.pipeline()
+		for scope in scopes:
+			pipeline.hincrby(frappe.cache.make_key(VERSIONS_KEY), scope, 1)
+		pipeline.execute()
+
+	clear_now_and_after_commit(bump_now)
+
+
+def on_employee_change(doc, method=None):
+	bump("employees")
+
+
+def on_timesheet_change(doc, method=None):
+	scopes = ["timesheets"]
+	if doc.employee:
+		scopes.append(f"timesheets:{doc.employee.upper()}")
+	before = doc.get_doc_before_save()
+	if before and before.employee and before.employee != doc.employee:
+		scopes.append(f"timesheets:{before.employee.upper()}")
+	bump(*scopes)
+
+
+def on_holiday_list_change(doc, method=None):
+	bump("holidays")
@@ -0,0 +1,114 @@
+import json
+from collections import defaultdict
+
+import frappe
+from frappe.utils import cint, getdate
+
+from timesheet_management_system.api.telegram_client import enqueue_message
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	get_ledger,
+)
+from timesheet_management_system.utils.metrics import increment, instrument
+
+EVENT = "timesheet_compliance"
+DIGEST_KEY = "timesheet_compliance_digest"
+DIGEST_LOCK_KEY = "timesheet_compliance_digest_lock"
+# roles that see every employee's compliance; anyone else only gets their own
+DELTA_ROLES = ("HR User", "HR Manager", "Projects User", "System Manager")
+
+
+def on_timesheet_change(doc, method=None):
+	"""Push the new ledger state of each day this Timesheet touches. Runs after the ledger handler."""
+	affected = {(doc.employee, getdate(doc.start_date))}
+	before = doc.get_doc_before_save()
+	if before and before.start_date:
+		affected.add((before.employee, getdate(before.start_date)))
+
+	role_users = get_role_users()
+	for employee, day in affected:
+		if employee and day:
+			publish_delta(get_delta(employee, day, doc), role_users)
+
+
+def get_role_users():
+	return set(
+		frappe.get_all(
+			"Has Role", filters={"parenttype": "User", "role": ["in", DELTA_ROLES]}, pluck="parent"
+		)
+	)
+
+
+def get_delta(employee, day, doc):
+	rows = get_ledger(day, employee=employee, fields=["employee_name", "status", "hours", "is_filled"])
+	row = rows[0] if rows else None
+	return {
+		"employee": employee,
+		"employee_name": row.employee_name if row else doc.employee_name,
+		"date": str(day),
+		# no ledger row: a working day with nothing on it
+		"status": (row.status if row else None) or "Pending",
+		"hours": (row.hours or 0) if row and row.is_filled else 0,
+		"timesheet": doc.name,
+	}
+
+
+def publish_delta(delta, role_users):
+	users = set(role_users)
+	if user_id := frappe.db.get_value("Employee", delta["employee"], "user_id"):
+		users.add(user_id)
+	for user in users:
+		frappe.publish_realtime(EVENT, delta, user=user, after_commit=True)
+	increment("timesheet.compliance.published")
+
+	if get_digest_interval():
+		# RedisWrapper.rpush prefixes the key itself
+		frappe.db.after_commit.add(lambda: frappe.cache.rpush(DIGEST_KEY, json.dumps(delta)))
+
+
+def get_digest_interval():
+	"""Minutes between Telegram digests of compliance changes; 0 (default) turns the digest off."""
+	return cint(frappe.conf.get("timesheet_compliance_digest_minutes"))
+
+
+def send_compliance_digest():
+	"""Runs every minute and posts once per digest interval."""
+	interval = get_digest_interval()
+	if not interval:
+		return
+	if not frappe.cache.set(frappe.cache.make_key(DIGEST_LOCK_KEY), 1, ex=interval * 60, nx=True):
+		return
+
+	frappe.enqueue("timesheet_management_system.api.compliance_events.post_compliance_digest", queue="short")
+
+
+@instrument("job.post_compliance_digest")
+def post_compliance_digest():
+	key = frappe.cache.make_key(DIGEST_KEY)
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, -1)
+	pipeline.delete(key)
+	entries, _ = pipeline.execute()
+	if not entries:
+		return
+
+	chat_id = frappe.conf.get("telegram_chat_id")
+	if not chat_id:
+		frappe.log_error("Missing Telegram bot token or chat_id", "Telegram Config Error")
+		return
+
+	# only the latest change of each employee-day counts
+	latest = {}
+	for entry in entries:
+		delta = json.loads(entry)
+		latest[(delta["employee"], delta["date"])] = delta
+
+	by_status = defaultdict(list)
+	for (employee, day), delta in sorted(latest.items()):
+		hours = f" ({delta['hours']:.1f} hrs)" if delta["status"] == "Filled" else ""
+		by_status[delta["status"]].append(f"• {delta['employee_name']} ({employee}): {day}{hours}")
+
+	msg = "*Timesheet updates*\n"
+	for status, lines in sorted(by_status.items()):
+		msg += f"\n*{status}*\n" + "\n".join(lines) + "\n"
+	enqueue_message(chat_id, msg)
+	return len(latest)
@@ -0,0 +1,129 @@
+import json
+import queue
+import threading
+
+import frappe
+from frappe.utils import cint
+
+from timesheet_management_system.api.telegram_bot import find_pending_employees
+from timesheet_management_system.api.telegram_client import send_with_retry
+from timesheet_management_system.utils.metrics import increment
+
+DEFAULT_WORKERS = 32
+MAX_REPORTED_FAILURES = 500
+FIELDS = ["name", "employee_name", "telegram_chat_id"]
+
+
+def send_direct_reminder_shard(employees, report_date):
+	return send_to(find_pending_employees(report_date, fields=FIELDS, employees=employees), report_date)
+
+
+def save_reminder_run(results, run, report_date):
+	"""Aggregation step: one Timesheet Reminder Run for all shards."""
+	if None not in results and not any(r["pending"] for r in results):
+		frappe.log_error("All employees have filled their timesheet for today ", "Timesheet Reminder")
+		return
+
+	return save_run(report_date, results, run.elapsed)
+
+
+def send_to(pending, report_date):
+	"""Message each pending employee in their own chat with the bot, within the shared rate limits."""
+	recipients = [emp for emp in pending if emp.telegram_chat_id]
+	failures = []
+
+	if recipients:
+		workers = min(cint(frappe.conf.get("telegram_fanout_workers")) or DEFAULT_WORKERS, len(recipients))
+		errors = send_all(
+			frappe.local.site,
+			workers,
+			[(emp.telegram_chat_id, get_message(emp, report_date)) for emp in recipients],
+		)
+		for emp, error in zip(recipients, errors, strict=True):
+			if error:
+				failures.append({"employee": emp.name, "chat_id": emp.telegram_chat_id, "error": error})
+
+	return {
+		"pending": len(pending),
+		"sent": len(recipients) - len(failures),
+		"skipped": len(pending) - len(recipients),
+		"failures": failures,
+	}
+
+
+def save_run(report_date, results, duration):
+	"""Record the outcome as a Timesheet Reminder Run. A shard that failed outright counts as None."""
+	failed_shards = results.count(None)
+	results = [r for r in results if r]
+	pending = sum(r["pending"] for r in results)
+	sent = sum(r["sent"] for r in results)
+	skipped = sum(r["skipped"] for r in results)
+	failures = [f for r in results for f in r["failures"]]
+
+	increment("telegram.direct_reminders.sent", sent)
+	increment("telegram.direct_reminders.failed", len(failures))
+	increment("telegram.direct_reminders.skipped", skipped)
+
+	run = frappe.get_doc(
+		{
+			"doctype": "Timesheet Reminder Run",
+			"report_date": report_date,
+			"status": get_run_status(sent, len(failures) + failed_shards),
+			"duration": duration,
+			"pending": pending,
+			"sent": sent,
+			"failed": len(failures),
+			"skipped": skipped,
+			"failures": json.dumps(failures[:MAX_REPORTED_FAILURES], indent=1) if failures else None,
+		}
+	)
+	run.insert(ignore_permissions=True)
+	return run.name
+
+
+def send_all(site, workers, messages):
+	"""Send (chat_id, text) messages on `workers` threads and return one error (or None) per message."""
+	jobs = queue.SimpleQueue()
+	for job in enumerate(messages):
+		jobs.put(job)
+	errors = [None] * len(messages)
+
+	def work():
+		frappe.init(site=site)
+		try:
+			while True:
+				try:
+					i, (chat_id, text) = jobs.get_nowait()
+				except queue.Empty:
+					return
+				errors[i] = send_one(chat_id, text)
+		finally:
+			frappe.destroy()
+
+	threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	return errors
+
+
+def send_one(chat_id, text):
+	"""Runs on a pool thread. Returns the error message, or None once Telegram accepted the message."""
+	try:
+		send_with_retry("sendMessage", {"chat_id": chat_id, "text": text, "parse_mode": "Markdown"})
+	except Exception as e:
+		return str(e)[:500]
+
+
+def get_message(employee, report_date):
+	return (
+		f"Hi {employee.employee_name}, your *timesheet for {report_date.strftime('%Y-%m-%d')}* "
+		"is not filled yet. Please fill it before you leave today."
+	)
+
+
+def get_run_status(sent, failed):
+	if not failed:
+		return "Completed"
+	return "Partially Failed" if sent else "Failed"
@@ -0,0 +1,290 @@
+import csv
+import io
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import cint, getdate
+
+from timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report import (
+	HashingWriter,
+	get_private_file_path,
+	insert_private_file,
+)
+from timesheet_management_system.utils.metrics import instrument
+
+FORMATS = ("csv", "xlsx", "parquet")
+DEFAULT_CHUNK_SIZE = 1000
+XLSX_SHEET_ROWS = 1_000_000
+COLUMNS = [
+	"Timesheet",
+	"Employee",
+	"Employee Name",
+	"Date",
+	"Status",
+	"Activity Type",
+	"Task",
+	"Project",
+	"From Time",
+	"To Time",
+	"Hours",
+]
+
+
+@frappe.whitelist(methods=["POST"])
+def export_timesheets(from_date, to_date, format="csv", employee=None, company=None, department=None):
+	"""Queue an export of Timesheet detail rows; progress arrives as `timesheet_export` realtime events."""
+	frappe.only_for(("System Manager", "HR Manager", "HR User"))
+
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	if from_date > to_date:
+		frappe.throw(_("From Date cannot be after To Date"))
+	if format not in FORMATS:
+		frappe.throw(_("Format must be one of {0}").format(", ".join(FORMATS)))
+	if format == "parquet":
+		try:
+			import pyarrow
+		except ImportError:
+			frappe.throw(_("Parquet export needs pyarrow installed in the bench environment"))
+
+	export_id = frappe.generate_hash(length=10)
+	frappe.enqueue(
+		"timesheet_management_system.api.export.run_export",
+		queue="long",
+		timeout=4 * 60 * 60,
+		export_id=export_id,
+		user=frappe.session.user,
+		filters=frappe._dict(
+			from_date=from_date,
+			to_date=to_date,
+			employee=employee,
+			company=company,
+			department=department,
+		),
+		format=format,
+	)
+	return export_id
+
+
+@instrument("job.export_timesheets")
+def run_export(export_id, user, filters, format):
+	file_name = f"Timesheets_{filters.from_date}_{filters.to_date}.{format}"
+	file_path = get_private_file_path(file_name)
+	total = count_timesheets(filters)
+	done = rows = 0
+
+	stream = HashingWriter(file_path)
+	try:
+		writer = WRITERS[format](stream)
+		try:
+			for timesheets, chunk in iter_chunks(filters):
+				writer.write(chunk)
+				done += timesheets
+				rows += len(chunk)
+				publish(user, export_id, "Running", done=done, total=total, rows=rows)
+		finally:
+			writer.close()
+			stream.close()
+	except Exception:
+		if os.path.exists(file_path):
+			os.remove(file_path)
+		frappe.log_error(title="Timesheet Export")
+		publish(user, export_id, "Failed", done=done, total=total, rows=rows)
+		return
+
+	file_doc = insert_private_file(file_path, stream)
+	# the File row has to be visible before the client follows the link
+	publish(
+		user,
+		export_id,
+		"Completed",
+		done=done,
+		total=total,
+		rows=rows,
+		file_url=file_doc.file_url,
+		after_commit=True,
+	)
+	return file_doc.name
+
+
+def publish(user, export_id, status, done, total, rows, file_url=None, after_commit=False):
+	frappe.publish_realtime(
+		"timesheet_export",
+		{
+			"export_id": export_id,
+			"status": status,
+			"progress": round(done * 100 / total, 1) if total else 100,
+			"rows": rows,
+			"file_url": file_url,
+		},
+		user=user,
+		after_commit=after_commit,
+	)
+
+
+def get_conditions(filters):
+	conditions = ["ts.start_date between %(from_date)s and %(to_date)s", "ts.docstatus < 2"]
+	if filters.employee:
+		conditions.append("ts.employee = %(employee)s")
+	if filters.company:
+		conditions.append("ts.company = %(company)s")
+	if filters.department:
+		conditions.append("ts.employee in (select name from `tabEmployee` where department = %(department)s)")
+	return " and ".join(conditions)
+
+
+def count_timesheets(filters):
+	count = frappe.db.sql(f"select count(*) from `tabTimesheet` ts where {get_conditions(filters)}", filters)
+	return count[0][0]
+
+
+def iter_chunks(filters):
+	"""Yield (timesheet count, detail rows) per chunk, seeking past the last (start_date, name) seen."""
+	chunk_size = cint(frappe.conf.get("timesheet_export_chunk_size")) or DEFAULT_CHUNK_SIZE
+	conditions = get_conditions(filters)
+	last = None
+
+	while True:
+		seek = ""
+		if last:
+			seek = "and (ts.start_date > %(last_date)s or (ts.start_date = %(last_date)s and ts.name > %(last_name)s))"
+		timesheets = frappe.db.sql(
+			f"""
+			select ts.name, ts.employee, ts.employee_name, ts.start_date, ts.docstatus
+			from `tabTimesheet` ts
+			where {conditions} {seek}
+			order by ts.start_date, ts.name
+			limit %(chunk_size)s
+			""",
+			{
+				**filters,
+				"chunk_size": chunk_size,
+				"last_date": last and last[0],
+				"last_name": last and last[1],
+			},
+			as_dict=True,
+		)
+		if not timesheets:
+			return
+
+		details = {}
+		for row in frappe.db.sql(
+			"""
+			select parent, activity_type, task, project, from_time, to_time, hours
+			from `tabTimesheet Detail`
+			where parent in %(names)s and parenttype = 'Timesheet'
+			order by parent, idx
+			""",
+			{"names": [ts.name for ts in timesheets]},
+			as_dict=True,
+		):
+			details.setdefault(row.parent, []).append(row)
+
+		chunk = [
+			(
+				ts.name,
+				ts.employee,
+				ts.employee_name,
+				ts.start_date,
+				"Submitted" if ts.docstatus == 1 else "Draft",
+				d.activity_type,
+				d.task,
+				d.project,
+				d.from_time,
+				d.to_time,
+				float(d.hours or 0),
+			)
+			for ts in timesheets
+			for d in details.get(ts.name, [])
+		]
+		yield len(timesheets), chunk
+
+		last = (timesheets[-1].start_date, timesheets[-1].name)
+		if len(timesheets) < chunk_size:
+			return
+
+
+class CSVWriter:
+	def __init__(self, stream):
+		self.file = io.TextIOWrapper(stream, newline="", encoding="utf-8")
+		self.writer = csv.writer(self.file)
+		self.writer.writerow(COLUMNS)
+
+	def write(self, rows):
+		self.writer.writerows(rows)
+
+	def close(self):
+		self.file.close()
+
+
+class XLSXWriter:
+	"""openpyxl's write-only mode streams rows to disk; a new sheet starts before Excel's row limit."""
+
+	def __init__(self, stream):
+		from openpyxl import Workbook
+
+		self.stream = stream
+		self.workbook = Workbook(write_only=True)
+		self.sheet = None
+		self.sheet_rows = 0
+		self.new_sheet()
+
+	def new_sheet(self):
+		self.sheet = self.workbook.create_sheet(f"Timesheets {len(self.workbook.worksheets) + 1}")
+		self.sheet.append(COLUMNS)
+		self.sheet_rows = 0
+
+	def write(self, rows):
+		for row in rows:
+			if self.sheet_rows >= XLSX_SHEET_ROWS:
+				self.new_sheet()
+			self.sheet.append(row)
+			self.sheet_rows += 1
+
+	def close(self):
+		self.workbook.save(self.stream)
+
+
+class ParquetWriter:
+	"""One row group per chunk, written as soon as the chunk is read."""
+
+	def __init__(self, stream):
+		import pyarrow as pa
+		import pyarrow.parquet as pq
+
+		self.pa = pa
+		self.schema = pa.schema(
+			[
+				("timesheet", pa.string()),
+				("employee", pa.string()),
+				("employee_name", pa.string()),
+				("date", pa.date32()),
+				("status", pa.string()),
+				("activity_type", pa.string()),
+				("task", pa.string()),
+				("project", pa.string()),
+				("from_time", pa.timestamp("us")),
+				("to_time", pa.timestamp("us")),
+				("hours", pa.float64()),
+			]
+		)
+		self.writer = pq.ParquetWriter(stream, self.schema)
+
+	def write(self, rows):
+		if rows:
+			columns = list(zip(*rows, strict=True))
+			self.writer.write_table(
+				self.pa.Table.from_arrays(
+					[
+						self.pa.array(values, type=field.type)
+						for values, field in zip(columns, self.schema, strict=True)
+					],
+					schema=self.schema,
+				)
+			)
+
+	def close(self):
+		self.writer.close()
+
+
+WRITERS = {"csv": CSVWriter, "xlsx": XLSXWriter, "parquet": ParquetWriter}
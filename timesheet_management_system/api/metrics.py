@@ -0,0 +1,37 @@
+import frappe
+from werkzeug.wrappers import Response
+
+from timesheet_management_system.utils.metrics import METRICS_KEY, PROFILE_KEY, get_metrics, to_prometheus
+from timesheet_management_system.utils.sharding import get_last_run
+
+
+@frappe.whitelist()
+def prometheus():
+	frappe.only_for("System Manager")
+	return Response(to_prometheus(get_metrics()), mimetype="text/plain; version=0.0.4")
+
+
+@frappe.whitelist(methods=["POST"])
+def reset_metrics():
+	frappe.only_for("System Manager")
+	frappe.cache.delete(frappe.cache.make_key(METRICS_KEY))
+
+
+@frappe.whitelist(methods=["POST"])
+def request_profile(name):
+	"""Run the next execution of the instrumented block `name` under cProfile."""
+	frappe.only_for("System Manager")
+	frappe.cache.hset(PROFILE_KEY, f"{name}|requested", 1)
+
+
+@frappe.whitelist()
+def get_profile(name):
+	frappe.only_for("System Manager")
+	return frappe.cache.hget(PROFILE_KEY, name)
+
+
+@frappe.whitelist()
+def get_shard_timings(job):
+	"""Per-shard employee counts and durations of the last sharded run of `job`."""
+	frappe.only_for("System Manager")
+	return get_last_run(job)
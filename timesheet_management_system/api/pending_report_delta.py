@@ -0,0 +1,110 @@
+import json
+from datetime import date, timedelta
+
+import frappe
+from frappe.utils import cint
+
+from timesheet_management_system.api.telegram_client import enqueue_message
+from timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report import (
+	save_private_csv,
+	send_document_to_chat,
+)
+from timesheet_management_system.utils.compliance import get_compliance
+from timesheet_management_system.utils.metrics import instrument
+
+CHECKPOINT_KEY = "weekly_pending_report_checkpoint"
+DEFAULT_MESSAGE_LIMIT = 50
+
+
+def send_daily_pending_report_delta():
+	"""Weekday runs of the delta report; the Friday weekly job covers Fridays."""
+	if frappe.conf.get("weekly_pending_report_mode") == "delta":
+		frappe.enqueue(
+			"timesheet_management_system.api.pending_report_delta.send_pending_report_delta", queue="long"
+		)
+
+
+def get_report_range(today=None):
+	"""The working week up to yesterday: Monday's run closes the previous week, later runs cover this one."""
+	last_day = (today or date.today()) - timedelta(days=1)
+	start_of_week = last_day - timedelta(days=last_day.weekday())
+	return start_of_week, min(start_of_week + timedelta(days=4), last_day)
+
+
+@instrument("job.send_pending_report_delta")
+def send_pending_report_delta():
+	"""Send only employees with newly pending days and employees who caught up since the last run."""
+	start_of_week, end_of_week = get_report_range()
+	employees = frappe.get_all(
+		"Employee", filters={"status": "Active"}, fields=["name", "employee_name"], order_by="name asc"
+	)
+	current = get_compliance(start_of_week, end_of_week, [e.name for e in employees]).pending_bitmasks()
+	previous = load_checkpoint(start_of_week)
+
+	newly_pending = {}
+	for employee, mask in current.items():
+		if new_days := mask & ~previous.get(employee, 0):
+			newly_pending[employee] = new_days
+	caught_up = [employee for employee in previous if employee not in current]
+
+	frappe.db.set_global(
+		CHECKPOINT_KEY,
+		json.dumps({"week": str(start_of_week), "as_of": str(end_of_week), "pending": current}),
+	)
+
+	if newly_pending or caught_up:
+		names = {e.name: e.employee_name for e in employees}
+		rows = [
+			[employee, names.get(employee), "Pending", ", ".join(mask_to_dates(start_of_week, mask))]
+			for employee, mask in newly_pending.items()
+		]
+		rows += [[employee, names.get(employee), "Caught up", ""] for employee in caught_up]
+		post_delta(rows, start_of_week, end_of_week)
+
+	return {"newly_pending": len(newly_pending), "caught_up": len(caught_up)}
+
+
+def load_checkpoint(start_of_week):
+	checkpoint = json.loads(frappe.db.get_global(CHECKPOINT_KEY) or "{}")
+	if checkpoint.get("week") != str(start_of_week):
+		return {}
+	return checkpoint.get("pending") or {}
+
+
+def mask_to_dates(start_of_week, mask):
+	return [
+		(start_of_week + timedelta(days=offset)).strftime("%Y-%m-%d")
+		for offset in range(mask.bit_length())
+		if mask >> offset & 1
+	]
+
+
+def post_delta(rows, start_of_week, end_of_week):
+	"""A chat message while the delta is short, otherwise a CSV of the same rows."""
+	caption = f"Pending Timesheets update ({start_of_week} → {end_of_week})"
+	limit = cint(frappe.conf.get("pending_report_delta_message_limit")) or DEFAULT_MESSAGE_LIMIT
+
+	if len(rows) > limit:
+		file_doc = save_private_csv(
+			f"Pending_Timesheets_Delta_{end_of_week}.csv",
+			["Employee ID", "Employee Name", "Change", "Pending Dates"],
+			rows,
+		)
+		send_document_to_chat(file_doc, caption)
+		return
+
+	chat_id = frappe.conf.get("telegram_chat_id")
+	if not chat_id:
+		frappe.log_error("Missing Telegram bot token or chat_id", "Telegram Config Error")
+		return
+
+	pending = [
+		f"• {name} ({employee}): {dates}" for employee, name, change, dates in rows if change == "Pending"
+	]
+	caught_up = [f"• {name} ({employee})" for employee, name, change, _ in rows if change == "Caught up"]
+	msg = f"*{caption}*\n"
+	if pending:
+		msg += "\n*Newly pending*\n" + "\n".join(pending) + "\n"
+	if caught_up:
+		msg += "\n*Caught up*\n" + "\n".join(caught_up) + "\n"
+	enqueue_message(chat_id, msg)
@@ -1,221 +1,521 @@
+import copy
+import hmac
 import json
 from datetime import date, timedelta
+from functools import cached_property
 
 import frappe
-import requests
+from frappe.utils import cint
+from werkzeug.wrappers import Response
+
+from timesheet_management_system.api.command_cache import cached_render
+from timesheet_management_system.api.telegram_client import enqueue_delivery, enqueue_message
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	LEDGER,
+	get_ledger,
+)
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup import (
+	ROLLUP,
+)
+from timesheet_management_system.utils.compliance import get_compliance
+from timesheet_management_system.utils.dedup import ACCEPTED, DUPLICATE, claim_update
+from timesheet_management_system.utils.employee_index import get_employee_index
+from timesheet_management_system.utils.metrics import increment, instrument, track
+from timesheet_management_system.utils.rate_limit import TokenBucket
+from timesheet_management_system.utils.replica import read_only, replica
+from timesheet_management_system.utils.sharding import fan_out
+from timesheet_management_system.utils.working_days import is_holiday, is_working_day
+
+COMMANDS = {}
+DEFAULT_PAGE_SIZE = 50
+
+WEBHOOK_GLOBAL_RATE = 50
+WEBHOOK_CHAT_RATE = 1
+WEBHOOK_CHAT_BURST = 5
+SLOW_DOWN_WINDOW = 60
+SLOW_DOWN = "You are sending messages too fast, please slow down."
+
+
+def command(name, description=None, needs=(), cache_scopes=None):
+	"""Register a bot command. `needs` lists the CommandContext properties it reads, for preloading."""
+
+	def decorator(fn):
+		COMMANDS[name] = frappe._dict(
+			handler=instrument(f"bot.command.{name}")(fn),
+			description=description,
+			needs=needs,
+			cache_scopes=cache_scopes,
+		)
+		return fn
+
+	return decorator
+
+
+class CommandContext:
+	"""Per-message data, loaded on first access so each command only pays for what it reads."""
+
+	def __init__(self, text, chat_id):
+		self.text = text
+		self.chat_id = chat_id
+		self.today = date.today()
+		self.start_of_week = self.today - timedelta(days=self.today.weekday())
+		self.end_of_week = self.start_of_week + timedelta(days=4)
+		# keyset position for paged commands: (">", last name shown) or ("<", first name shown)
+		self.page = (">", None)
+
+	def for_message(self, text, chat_id):
+		"""A context for another message that reuses whatever this one has already loaded."""
+		ctx = copy.copy(self)
+		ctx.text = text
+		ctx.chat_id = chat_id
+		ctx.page = (">", None)
+		return ctx
+
+	@property
+	def args(self):
+		"""Whatever follows the command word, e.g. the name in `/find john`."""
+		parts = self.text.split(maxsplit=1)
+		return parts[1] if len(parts) > 1 else ""
+
+	def preload(self, texts):
+		"""Load, once, everything the commands in `texts` will read."""
+		for text in texts:
+			cmd = COMMANDS.get(text.split(maxsplit=1)[0].lower())
+			for prop in cmd.needs if cmd else ():
+				getattr(self, prop)
+
+	@cached_property
+	def all_employees(self):
+		return frappe.get_all("Employee", fields=["name", "employee_name"], filters={"status": "Active"})
+
+	def get_employee_page(self):
+		"""One page of active employees after/before the cursor, plus whether earlier/later pages exist."""
+		direction, cursor = self.page
+		page_size = cint(frappe.conf.get("telegram_page_size")) or DEFAULT_PAGE_SIZE
+
+		filters = {"status": "Active"}
+		if cursor:
+			filters["name"] = [direction, cursor]
+		rows = frappe.get_all(
+			"Employee",
+			filters=filters,
+			fields=["name", "employee_name"],
+			order_by="name asc" if direction == ">" else "name desc",
+			limit=page_size + 1,
+		)
+
+		has_more = len(rows) > page_size
+		rows = rows[:page_size]
+		if direction == "<":
+			rows.reverse()
+			return rows, has_more, True
+		return rows, bool(cursor), has_more
 
 
 @frappe.whitelist(allow_guest=True)
 def telegram_webhook():
+	"""Ack fast: check the secret and rate limits, drop redelivered updates and queue the rest."""
 	try:
+		if not verify_secret_token():
+			increment("telegram.webhook.forbidden")
+			return Response("Forbidden", status=403)
+
 		try:
 			data = json.loads(frappe.request.data or "{}")
 		except Exception:
 			data = {}
 
-		message = data.get("message", {})
-		text = (message.get("text") or "").strip()
-		chat_id = message.get("chat", {}).get("id")
+		if frappe.conf.get("telegram_update_mode") == "polling":
+			return "Updates are consumed by the polling worker"
+
+		if limited := check_rate_limits(data):
+			increment(f"telegram.webhook.rejected.{limited}")
+			return slow_down_reply(data)
+		increment("telegram.webhook.allowed")
+
+		update_id = data.get("update_id")
+		if update_id is not None:
+			claim = claim_update(update_id)
+			if claim != ACCEPTED:
+				increment("telegram.updates.duplicate" if claim == DUPLICATE else "telegram.updates.stale")
+				return "OK"
+
+		increment("telegram.updates.accepted")
+		frappe.enqueue(
+			"timesheet_management_system.api.telegram_bot.process_update",
+			queue="short",
+			update=data,
+		)
+		return "OK"
 
-		if not text or not chat_id:
-			return "No message or chat_id found"
+	except Exception as e:
+		frappe.log_error(f"Telegram webhook error: {e}", "Telegram Webhook")
+		return f"Error: {e}"
 
-		bot_token = frappe.conf.get("telegram_bot_token")
-		telegram_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
 
-		all_employees = frappe.get_all(
-			"Employee", fields=["name", "employee_name"], filters={"status": "Active"}
-		)
+def verify_secret_token():
+	"""Telegram echoes the secret given to setWebhook in every request; forged requests cannot."""
+	secret = frappe.conf.get("telegram_webhook_secret")
+	if not secret:
+		return True
+	header = frappe.get_request_header("X-Telegram-Bot-Api-Secret-Token") or ""
+	return hmac.compare_digest(header.encode(), secret.encode())
 
-		today = date.today()
-		start_of_week = today - timedelta(days=today.weekday())
-		end_of_week = start_of_week + timedelta(days=4)
 
-		timesheets = frappe.get_all(
-			"Timesheet",
-			filters={"start_date": ["between", [start_of_week, end_of_week]], "docstatus": 1},
-			fields=["employee", "start_date", "total_hours"],
+def check_rate_limits(update):
+	"""Name of the bucket that is out of tokens ("chat" or "global"), or None when the update may pass."""
+	_, chat_id = parse_update(update)
+	if chat_id is not None:
+		chat_bucket = TokenBucket(
+			f"telegram|webhook|chat|{chat_id}",
+			frappe.conf.get("telegram_webhook_chat_rate") or WEBHOOK_CHAT_RATE,
+			capacity=frappe.conf.get("telegram_webhook_chat_burst") or WEBHOOK_CHAT_BURST,
 		)
+		if chat_bucket.try_acquire():
+			return "chat"
 
-		holiday_list = frappe.get_all(
-			"Holiday",
-			filters={"holiday_date": ["between", [start_of_week, end_of_week]]},
-			pluck="holiday_date",
-		)
+	global_rate = frappe.conf.get("telegram_webhook_rate") or WEBHOOK_GLOBAL_RATE
+	if TokenBucket("telegram|webhook|global", global_rate, capacity=global_rate * 2).try_acquire():
+		return "global"
 
-		if text.lower() == "/employee":
-			if all_employees:
-				msg = "\n".join([f"{e.employee_name} (`{e.name}`)" for e in all_employees])
-			else:
-				msg = "No active employees found."
-			payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-			requests.post(telegram_url, json=payload)
-			return "OK"
-
-		elif text.lower() == "/timesheet":
-			report_date = today - timedelta(days=1)
-			if report_date.weekday() == 6:  # Sunday
-				report_date -= timedelta(days=2)
-			elif report_date.weekday() == 5:  # Saturday
-				report_date -= timedelta(days=1)
-			elif report_date.weekday() == 0:  # Monday
-				report_date -= timedelta(days=3)
-
-			filled_timesheets = frappe.get_all(
-				"Timesheet", filters={"start_date": report_date, "docstatus": 1}, fields=["employee"]
-			)
-			filled_emp_ids = {t.employee for t in filled_timesheets}
-
-			draft_timesheets = frappe.get_all(
-				"Timesheet", filters={"start_date": report_date, "docstatus": 0}, fields=["employee"]
-			)
-			draft_emp_ids = {t.employee for t in draft_timesheets}
-
-			leave_applications = frappe.get_all(
-				"Leave Application",
-				filters={"from_date": ["<=", report_date], "to_date": [">=", report_date]},
-				fields=["employee"],
-			)
-			leave_ids = {la.employee for la in leave_applications}
-
-			holiday = frappe.db.exists("Holiday", {"holiday_date": report_date})
-
-			filled_list, draft, pending, pending_on_leave = [], [], [], []
-
-			for emp in all_employees:
-				if emp.name in filled_emp_ids:
-					filled_list.append(f"{emp.employee_name}")
-				elif emp.name in draft_emp_ids:
-					draft.append(f"{emp.employee_name}")
-				elif emp.name in leave_ids:
-					pending_on_leave.append(f"{emp.employee_name} (Leave Request Raised)")
-				else:
-					pending.append(f"{emp.employee_name}")
-
-			msg = f"*Timesheet Summary for {report_date.strftime('%Y-%m-%d')}:*\n\n"
-			if holiday:
-				msg += "            *Today is a Holiday*\n\n"
-
-			msg += "*Filled*\n" + ("\n".join(filled_list)) + "\n\n"
-			if pending:
-				msg += "*Not Filled*\n" + "\n".join(pending) + "\n\n"
-			if draft:
-				msg += "*Draft*\n" + "\n".join(draft) + "\n\n"
-			if pending_on_leave:
-				msg += "*Leave*\n" + "\n".join(pending_on_leave) + "\n\n"
-			if not (filled_list or pending or draft or pending_on_leave):
-				msg += "*Everyone has filled their timesheet!*"
-
-			payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-			requests.post(telegram_url, json=payload)
-			return "OK"
-
-		elif text.lower() == "/weeklyhours":
-			if not timesheets:
-				msg = f"No timesheet data found for this week ({start_of_week} → {end_of_week})."
-			else:
-				msg = f"*Weekly Hours* ({start_of_week} → {end_of_week})\n"
-				for emp in all_employees:
-					total_hours = sum(t.total_hours for t in timesheets if t.employee == emp.name)
-					msg += f"{emp.employee_name} — {total_hours:.1f} hrs\n"
-
-			payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-			requests.post(telegram_url, json=payload)
-			return "OK"
-
-		elif text.upper() in [emp.name.upper() for emp in all_employees]:
-			matched_emp = next((emp for emp in all_employees if emp.name.upper() == text.upper()), None)
-
-			if matched_emp:
-				emp_timesheets = [t for t in timesheets if t.employee == matched_emp.name]
-				filled_days = {t.start_date for t in emp_timesheets}
-
-				missing_days = []
-				current = start_of_week
-				while current <= end_of_week:
-					if current.weekday() < 5 and current not in holiday_list and current not in filled_days:
-						missing_days.append(current)
-					current += timedelta(days=1)
-
-				if emp_timesheets:
-					total_hours = sum(t.total_hours for t in emp_timesheets)
-					msg = (
-						f"*Weekly Timesheet for {matched_emp.employee_name} -{matched_emp.name}*\n"
-						f"*Total Hours Worked*: {total_hours:.1f} hrs\n"
-					)
-					if missing_days:
-						msg += "\n*Pending Days:*\n" + "\n".join(
-							[day.strftime("%Y-%m-%d") for day in missing_days]
-						)
-					else:
-						msg += "\n*All timesheets filled this week!*"
-				else:
-					msg = (
-						f"No timesheet records found for {matched_emp.employee_name} "
-						f"({matched_emp.name}) this week."
-					)
-			else:
-				msg = "Employee not found. Please check the Employee ID and try again."
-
-			payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-			requests.post(telegram_url, json=payload)
-			return "OK"
 
-		else:
-			if text.lower() == "/help":
-				msg = (
-					"*Available Commands:*\n"
-					"/employee - List all active employees\n"
-					"/timesheet - Show yesterday's timesheet summary\n"
-					"/weeklyhours - Show weekly worked hours by employee\n"
-					"/help - Show this help message\n"
-				)
-			else:
-				msg = "Type /help to see available commands."
-
-			payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-			requests.post(telegram_url, json=payload)
-			return "OK"
+def slow_down_reply(update):
+	"""Answer a rate-limited update in the webhook response, at most once per chat per window."""
+	_, chat_id = parse_update(update)
+	if chat_id is None:
+		return "OK"
+
+	first = frappe.cache.set(
+		frappe.cache.make_key(f"telegram_slow_down|{chat_id}"), 1, ex=SLOW_DOWN_WINDOW, nx=True
+	)
+	if not first:
+		return "OK"
+
+	if callback := update.get("callback_query"):
+		reply = {"method": "answerCallbackQuery", "callback_query_id": callback.get("id"), "text": SLOW_DOWN}
+	else:
+		reply = {"method": "sendMessage", "chat_id": chat_id, "text": SLOW_DOWN}
+	return Response(json.dumps(reply), mimetype="application/json")
 
+
+def process_update(update):
+	try:
+		handle_update(update)
 	except Exception as e:
 		frappe.log_error(f"Telegram webhook error: {e}", "Telegram Webhook")
-		return f"Error: {e}"
 
 
-def generate_reminder_message():
-	today = date.today()
-	report_date = today
+def parse_update(update):
+	if callback := update.get("callback_query"):
+		message = callback.get("message") or {}
+		return (callback.get("data") or "").partition("|")[0], message.get("chat", {}).get("id")
+
+	message = update.get("message", {})
+	return (message.get("text") or "").strip(), message.get("chat", {}).get("id")
+
+
+def handle_update(update, ctx=None):
+	if callback := update.get("callback_query"):
+		return handle_callback(callback, ctx)
+
+	text, chat_id = parse_update(update)
+
+	if not text or not chat_id:
+		return "No message or chat_id found"
+
+	ctx = ctx.for_message(text, chat_id) if ctx else CommandContext(text, chat_id)
+	reply = dispatch_command(ctx)
+	if isinstance(reply, str):
+		enqueue_message(chat_id, reply)
+	else:
+		enqueue_message(chat_id, reply.text, reply_markup=reply.reply_markup)
+	return "OK"
+
+
+def handle_callback(callback, ctx=None):
+	"""Page buttons carry "<command>|<direction>|<cursor>"; the page replaces the message in place."""
+	enqueue_delivery("answerCallbackQuery", {"callback_query_id": callback.get("id")})
+
+	command, _, page = (callback.get("data") or "").partition("|")
+	direction, _, cursor = page.partition("|")
+	message = callback.get("message") or {}
+	chat_id = message.get("chat", {}).get("id")
+	if command not in COMMANDS or direction not in (">", "<") or not chat_id:
+		return "Unknown callback"
+
+	ctx = ctx.for_message(command, chat_id) if ctx else CommandContext(command, chat_id)
+	ctx.page = (direction, cursor or None)
+	reply = dispatch_command(ctx)
+	if isinstance(reply, str):
+		reply = frappe._dict(text=reply, reply_markup=None)
+
+	payload = {
+		"chat_id": chat_id,
+		"message_id": message.get("message_id"),
+		"text": reply.text,
+		"parse_mode": "Markdown",
+	}
+	if reply.reply_markup:
+		payload["reply_markup"] = reply.reply_markup
+	enqueue_delivery("editMessageText", payload)
+	return "OK"
+
+
+def paged_reply(command, text, rows, has_prev, has_next):
+	buttons = []
+	if has_prev and rows:
+		buttons.append({"text": "« Prev", "callback_data": f"{command}|<|{rows[0].name}"})
+	if has_next and rows:
+		buttons.append({"text": "Next »", "callback_data": f"{command}|>|{rows[-1].name}"})
+	return frappe._dict(text=text, reply_markup={"inline_keyboard": [buttons]} if buttons else None)
+
+
+def dispatch_command(ctx):
+	name = ctx.text.split(maxsplit=1)[0].lower()
+	cmd = COMMANDS.get(name)
+	if cmd and cmd.cache_scopes:
+		direction, cursor = ctx.page
+		return cached_render(
+			name, f"{direction}{cursor or ''}", ctx.start_of_week, cmd.cache_scopes, lambda: cmd.handler(ctx)
+		)
+	if cmd:
+		# cached commands render on the primary anyway, see cached_render
+		with replica():
+			return cmd.handler(ctx)
+
+	if not ctx.text.startswith("/") and (employee := get_employee_index().get(ctx.text)):
+		employee_id = employee.name.upper()
+		return cached_render(
+			"employee_id",
+			employee_id,
+			ctx.start_of_week,
+			["employees", "holidays", f"timesheets:{employee_id}"],
+			lambda: employee_id_command(ctx, employee),
+		)
+
+	return "Type /help to see available commands."
+
 
-	all_employees = frappe.get_all("Employee", fields=["name", "employee_name"], filters={"status": "Active"})
+def employee_id_command(ctx, employee):
+	with track("bot.command.employee_id"):
+		return employee_week_summary(ctx, employee)
 
-	filled_timesheets = frappe.get_all(
-		"Timesheet", filters={"start_date": report_date, "docstatus": 1}, fields=["employee"]
+
+@command("/employee", "List all active employees", cache_scopes=["employees"])
+def employee_command(ctx):
+	rows, has_prev, has_next = ctx.get_employee_page()
+	if not rows:
+		return "No active employees found."
+	return paged_reply(
+		"/employee", "\n".join([f"{e.employee_name} (`{e.name}`)" for e in rows]), rows, has_prev, has_next
 	)
-	filled_emp_ids = {t.employee for t in filled_timesheets}
-
-	leave_applications = frappe.get_all(
-		"Leave Application",
-		filters={
-			"from_date": ["<=", report_date],
-			"to_date": [">=", report_date],
-		},
-		fields=["employee"],
+
+
+@command("/find", "Find employees by name or ID: /find <partial name>")
+def find_command(ctx):
+	if not ctx.args:
+		return "Usage: /find <partial name or employee ID>"
+
+	matches = get_employee_index().find(ctx.args)
+	if not matches:
+		return f"No active employees match _{ctx.args}_."
+	return "\n".join([f"{e.employee_name} (`{e.name}`)" for e in matches])
+
+
+@command("/timesheet", "Show yesterday's timesheet summary", needs=("all_employees",))
+def timesheet_command(ctx):
+	report_date = ctx.today - timedelta(days=1)
+	if report_date.weekday() == 6:  # Sunday
+		report_date -= timedelta(days=2)
+	elif report_date.weekday() == 5:  # Saturday
+		report_date -= timedelta(days=1)
+	elif report_date.weekday() == 0:  # Monday
+		report_date -= timedelta(days=3)
+
+	ledger = get_ledger(report_date)
+	status_by_employee = {row.employee: row.status for row in ledger}
+	holiday = is_holiday(report_date)
+
+	filled_list, draft, pending, pending_on_leave = [], [], [], []
+
+	for emp in ctx.all_employees:
+		status = status_by_employee.get(emp.name)
+		if status == "Filled":
+			filled_list.append(f"{emp.employee_name}")
+		elif status == "Draft":
+			draft.append(f"{emp.employee_name}")
+		elif status == "Leave":
+			pending_on_leave.append(f"{emp.employee_name} (Leave Request Raised)")
+		else:
+			pending.append(f"{emp.employee_name}")
+
+	msg = f"*Timesheet Summary for {report_date.strftime('%Y-%m-%d')}:*\n\n"
+	if holiday:
+		msg += "            *Today is a Holiday*\n\n"
+
+	msg += "*Filled*\n" + ("\n".join(filled_list)) + "\n\n"
+	if pending:
+		msg += "*Not Filled*\n" + "\n".join(pending) + "\n\n"
+	if draft:
+		msg += "*Draft*\n" + "\n".join(draft) + "\n\n"
+	if pending_on_leave:
+		msg += "*Leave*\n" + "\n".join(pending_on_leave) + "\n\n"
+	if not (filled_list or pending or draft or pending_on_leave):
+		msg += "*Everyone has filled their timesheet!*"
+
+	return msg
+
+
+@command(
+	"/weeklyhours",
+	"Show weekly worked hours by employee",
+	cache_scopes=["employees", "timesheets"],
+)
+def weeklyhours_command(ctx):
+	week = [ctx.start_of_week, ctx.end_of_week]
+	if not ctx.page[1] and not frappe.db.exists(LEDGER, {"date": ["between", week], "is_filled": 1}):
+		return f"No timesheet data found for this week ({ctx.start_of_week} → {ctx.end_of_week})."
+
+	rows, has_prev, has_next = ctx.get_employee_page()
+	hours_by_employee = dict(
+		frappe.get_all(
+			LEDGER,
+			filters={
+				"employee": ["in", [e.name for e in rows] or [""]],
+				"date": ["between", week],
+				"is_filled": 1,
+			},
+			fields=["employee", "sum(hours) as hours"],
+			group_by="employee",
+			as_list=True,
+		)
 	)
-	leave_ids = {l.employee for l in leave_applications}
 
-	if frappe.db.exists("Holiday", {"holiday_date": report_date}):
-		frappe.log_error(f"Today ({report_date}) is a holiday — no reminders sent.", "Timesheet Reminder")
-		return
+	msg = f"*Weekly Hours* ({ctx.start_of_week} → {ctx.end_of_week})\n"
+	for emp in rows:
+		msg += f"{emp.employee_name} — {hours_by_employee.get(emp.name) or 0:.1f} hrs\n"
+	return paged_reply("/weeklyhours", msg, rows, has_prev, has_next)
+
+
+@command(
+	"/monthlyhours",
+	"Show this month's hours, filled and pending days by employee",
+	cache_scopes=["employees", "timesheets"],
+)
+def monthlyhours_command(ctx):
+	rows, has_prev, has_next = ctx.get_employee_page()
+	totals = {
+		r.employee: r
+		for r in frappe.get_all(
+			ROLLUP,
+			filters={
+				"employee": ["in", [e.name for e in rows] or [""]],
+				"year": ctx.today.year,
+				"month": ctx.today.month,
+			},
+			fields=["employee", "total_hours", "filled_days", "pending_days"],
+		)
+	}
+
+	msg = f"*Monthly Hours* ({ctx.today.strftime('%B %Y')})\n"
+	for emp in rows:
+		r = totals.get(emp.name) or frappe._dict(total_hours=0, filled_days=0, pending_days=0)
+		msg += (
+			f"{emp.employee_name} — {r.total_hours or 0:.1f} hrs, "
+			f"{r.filled_days} filled, {r.pending_days} pending\n"
+		)
+	return paged_reply("/monthlyhours", msg, rows, has_prev, has_next)
+
+
+@command(
+	"/yearhours",
+	"Show this year's hours and pending days by employee",
+	cache_scopes=["employees", "timesheets"],
+)
+def yearhours_command(ctx):
+	rows, has_prev, has_next = ctx.get_employee_page()
+	totals = {
+		r.employee: r
+		for r in frappe.get_all(
+			ROLLUP,
+			filters={"employee": ["in", [e.name for e in rows] or [""]], "year": ctx.today.year},
+			fields=["employee", "sum(total_hours) as total_hours", "sum(pending_days) as pending_days"],
+			group_by="employee",
+		)
+	}
 
-	pending = []
-	for emp in all_employees:
-		if emp.name not in filled_emp_ids and emp.name not in leave_ids:
-			pending.append(emp.employee_name)
+	msg = f"*Yearly Hours* ({ctx.today.year})\n"
+	for emp in rows:
+		r = totals.get(emp.name) or frappe._dict(total_hours=0, pending_days=0)
+		msg += f"{emp.employee_name} — {r.total_hours or 0:.1f} hrs, {r.pending_days or 0} pending days\n"
+	return paged_reply("/yearhours", msg, rows, has_prev, has_next)
 
+
+@command("/help", "Show this help message")
+def help_command(ctx):
+	return "*Available Commands:*\n" + "".join(
+		f"{name} - {cmd.description}\n" for name, cmd in COMMANDS.items()
+	)
+
+
+def employee_week_summary(ctx, employee):
+	matrix = get_compliance(ctx.start_of_week, ctx.end_of_week, [employee.name])
+
+	if not matrix.filled.any():
+		return f"No timesheet records found for {employee.employee_name} ({employee.name}) this week."
+
+	missing_days = matrix.pending_dates().get(employee.name, [])
+	total_hours = matrix.total_hours()[employee.name]
+	msg = (
+		f"*Weekly Timesheet for {employee.employee_name} -{employee.name}*\n"
+		f"*Total Hours Worked*: {total_hours:.1f} hrs\n"
+	)
+	if missing_days:
+		msg += "\n*Pending Days:*\n" + "\n".join([day.strftime("%Y-%m-%d") for day in missing_days])
+	else:
+		msg += "\n*All timesheets filled this week!*"
+	return msg
+
+
+@read_only
+def find_pending_employees(report_date, fields=None, employees=None):
+	"""Active employees, optionally only those named in `employees`, who neither filled a timesheet nor are on leave."""
+	filters = {"status": "Active"}
+	ledger_filter = None
+	if employees is not None:
+		filters["name"] = ledger_filter = ["in", employees or [""]]
+
+	all_employees = frappe.get_all(
+		"Employee", fields=fields or ["name", "employee_name"], filters=filters, order_by="name asc"
+	)
+
+	ledger = get_ledger(report_date, employee=ledger_filter, fields=["employee", "is_filled", "on_leave"])
+	done_ids = {row.employee for row in ledger if row.is_filled or row.on_leave}
+
+	return [emp for emp in all_employees if emp.name not in done_ids]
+
+
+def log_holiday(report_date):
+	frappe.log_error(f"Today ({report_date}) is a holiday — no reminders sent.", "Timesheet Reminder")
+
+
+def collect_pending_names(employees, report_date):
+	"""Shard step of the sharded reminder: (employee, name) pairs, so the merge can order them by employee."""
+	return [(emp.name, emp.employee_name) for emp in find_pending_employees(report_date, employees=employees)]
+
+
+def merge_pending_names(results, run, report_date):
+	"""Aggregation step of the sharded reminder: one list for the group chat, in employee order."""
+	pending = sorted(tuple(pair) for pairs in results if pairs for pair in pairs)
 	if not pending:
-		frappe.log_error("All employees have filled their timesheet for today ", "Timesheet Reminder")
+		if None not in results:
+			frappe.log_error("All employees have filled their timesheet for today ", "Timesheet Reminder")
 		return
 
+	return post_reminder_list(report_date, [name for _, name in pending])
+
+
+def post_reminder_list(report_date, pending):
 	bot_token = frappe.conf.get("telegram_bot_token")
 	chat_id = frappe.conf.get("telegram_chat_id")
 
@@ -223,35 +523,49 @@ def generate_reminder_message():
 		frappe.log_error("Missing Telegram bot token or chat_id in site_config.json", "Timesheet Reminder")
 		return
 
-	telegram_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-
-	pending_list_text = "\n".join([f"• {emp}" for emp in pending])
+	pending_list_text = "\n".join([f"• {name}" for name in pending])
 	msg = (
 		f"*Timesheet Reminder for {report_date.strftime('%Y-%m-%d')}*\n\n"
 		f"The following employees have *not filled* their timesheet yet:\n\n"
 		f"{pending_list_text}\n\n"
 	)
 
-	payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-	requests.post(telegram_url, json=payload)
+	enqueue_message(chat_id, msg)
 	return "OK"
 
 
 @frappe.whitelist()
 def send_reminder():
-	frappe.enqueue("timesheet_management_system.api.telegram_bot.generate_reminder_message", queue="long")
+	"""Send the 18:00 reminder as a group list, direct messages or both (`telegram_reminder_mode`)."""
+	report_date = date.today()
+	if not is_working_day(report_date):
+		log_holiday(report_date)
+		return
+
+	mode = frappe.conf.get("telegram_reminder_mode") or "group"
+	if mode in ("group", "both"):
+		fan_out(
+			"send_reminder",
+			"timesheet_management_system.api.telegram_bot.collect_pending_names",
+			"timesheet_management_system.api.telegram_bot.merge_pending_names",
+			report_date=report_date,
+		)
+	if mode in ("direct", "both"):
+		fan_out(
+			"send_direct_reminders",
+			"timesheet_management_system.api.direct_reminders.send_direct_reminder_shard",
+			"timesheet_management_system.api.direct_reminders.save_reminder_run",
+			report_date=report_date,
+		)
 
 
+@instrument("job.generate_day_reminders")
 def generate_day_reminders():
 	msg = "*Please Fill Your Timesheet at the End of the Day*"
 
-	bot_token = frappe.conf.get("telegram_bot_token")
 	chat_id = frappe.conf.get("telegram_chat_id")
 
-	telegram_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-
-	payload = {"chat_id": chat_id, "text": msg, "parse_mode": "Markdown"}
-	requests.post(telegram_url, json=payload)
+	enqueue_message(chat_id, msg)
 	return "OK"
 
 
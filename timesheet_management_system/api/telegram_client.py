@@ -0,0 +1,239 @@
+import json
+import mimetypes
+import random
+import time
+from datetime import timedelta
+
+import frappe
+import requests
+from requests.adapters import HTTPAdapter
+
+from timesheet_management_system.utils.metrics import track
+from timesheet_management_system.utils.rate_limit import TokenBucket
+
+DEFAULT_API_URL = "https://api.telegram.org"
+DEFAULT_TIMEOUT = (3.05, 30)
+DEFAULT_MAX_ATTEMPTS = 5
+MAX_BACKOFF = 60
+DEFAULT_QUEUE = "default"
+# a drain job that died holding its chat's lock blocks the chat for at most this long
+DRAIN_LOCK_TTL = 300
+
+# Telegram allows ~30 messages/s per bot, 1 message/s per private chat and 20 messages/min per group.
+GLOBAL_RATE = 30
+PRIVATE_CHAT_RATE = 1
+GROUP_CHAT_RATE = 20 / 60
+
+_session = None
+
+
+class RetryableError(Exception):
+	def __init__(self, message, retry_after=None):
+		super().__init__(message)
+		self.retry_after = retry_after
+
+
+def get_session():
+	"""Process-wide pooled HTTP session, reused across every job the worker runs."""
+	global _session
+	if _session is None:
+		pool_size = frappe.conf.get("telegram_pool_size") or 10
+		session = requests.Session()
+		session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+		session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+		_session = session
+	return _session
+
+
+def get_api_url(method):
+	base_url = (frappe.conf.get("telegram_api_url") or DEFAULT_API_URL).rstrip("/")
+	return f"{base_url}/bot{frappe.conf.get('telegram_bot_token')}/{method}"
+
+
+def enqueue_message(chat_id, text, parse_mode="Markdown", **kwargs):
+	payload = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode, **kwargs}
+	enqueue_delivery("sendMessage", payload)
+
+
+def enqueue_document(chat_id, file_name, caption=None):
+	"""Queue a private File for upload; the worker reads its content so the job payload stays small."""
+	enqueue_delivery("sendDocument", {"chat_id": chat_id, "caption": caption}, file_name=file_name)
+
+
+def enqueue_delivery(method, payload, file_name=None):
+	"""Append the call to its chat's outbox once the transaction commits; one drain job per chat sends it."""
+	chat_id = payload.get("chat_id")
+	item = json.dumps(
+		{"method": method, "payload": payload, "file_name": file_name, "attempt": 0}, default=str
+	)
+
+	def push():
+		frappe.cache.rpush(get_outbox_key(chat_id), item)
+		schedule_drain(chat_id)
+
+	frappe.db.after_commit.add(push)
+
+
+def get_delivery_queue():
+	return frappe.conf.get("telegram_queue") or DEFAULT_QUEUE
+
+
+def get_outbox_key(chat_id):
+	return f"telegram_outbox|{chat_id}"
+
+
+def schedule_drain(chat_id, delay=0):
+	method = "timesheet_management_system.api.telegram_client.drain_outbox"
+	if not delay:
+		frappe.enqueue(method, queue=get_delivery_queue(), chat_id=chat_id)
+		return
+
+	from frappe.utils.background_jobs import execute_job, get_queue
+
+	# the RQ scheduler (run by every Frappe worker) enqueues it once the delay is up
+	get_queue(get_delivery_queue()).enqueue_in(
+		timedelta(seconds=delay),
+		execute_job,
+		kwargs={
+			"site": frappe.local.site,
+			"user": frappe.session.user,
+			"method": method,
+			"event": None,
+			"job_name": method,
+			"is_async": True,
+			"kwargs": {"chat_id": chat_id},
+		},
+	)
+
+
+def drain_outbox(chat_id):
+	"""Send a chat's queued calls in order, rescheduling instead of sleeping when it has to wait."""
+	lock_key = frappe.cache.make_key(f"telegram_outbox_lock|{chat_id}")
+	while frappe.cache.set(lock_key, 1, ex=DRAIN_LOCK_TTL, nx=True):
+		try:
+			delay = send_outbox(chat_id)
+		finally:
+			frappe.cache.delete(lock_key)
+
+		if delay:
+			schedule_drain(chat_id, delay)
+			return
+		# a call pushed while the lock was held found it taken; pick it up before leaving
+		if not frappe.cache.llen(get_outbox_key(chat_id)):
+			return
+
+
+def send_outbox(chat_id):
+	"""Send queued calls until the outbox is empty (returns 0) or sending has to wait (returns the seconds)."""
+	key = get_outbox_key(chat_id)
+	max_attempts = frappe.conf.get("telegram_max_attempts") or DEFAULT_MAX_ATTEMPTS
+
+	while head := frappe.cache.lrange(key, 0, 0):
+		item = json.loads(head[0])
+		wait = get_rate_limit_wait(chat_id)
+		if wait:
+			return wait
+
+		try:
+			with track(f"telegram.{item['method']}"):
+				call_api(item["method"], item["payload"], item["file_name"])
+		except RetryableError as e:
+			item["attempt"] += 1
+			if item["attempt"] < max_attempts:
+				frappe.cache.lset(frappe.cache.make_key(key), 0, json.dumps(item, default=str))
+				return e.retry_after or backoff_delay(item["attempt"] - 1)
+			dead_letter(item["method"], item["payload"], item["file_name"], e)
+		except Exception as e:
+			dead_letter(item["method"], item["payload"], item["file_name"], e)
+
+		frappe.cache.lpop(key)
+
+	return 0
+
+
+def send_with_retry(method, payload, file_name=None):
+	"""Send one Telegram API call within the rate limits, retrying 429/5xx. Raises the last error."""
+	max_attempts = frappe.conf.get("telegram_max_attempts") or DEFAULT_MAX_ATTEMPTS
+
+	for attempt in range(max_attempts):
+		wait_for_rate_limit(payload.get("chat_id"))
+		try:
+			with track(f"telegram.{method}"):
+				return call_api(method, payload, file_name)
+		except RetryableError as e:
+			if attempt + 1 == max_attempts:
+				raise
+			time.sleep(e.retry_after or backoff_delay(attempt))
+
+
+def call_api(method, payload, file_name=None):
+	try:
+		if file_name:
+			file_doc = frappe.get_doc("File", file_name)
+			mimetype, encoding = mimetypes.guess_type(file_doc.file_name)
+			if encoding == "gzip":
+				mimetype = "application/gzip"
+			with open(file_doc.get_full_path(), "rb") as f:
+				response = get_session().post(
+					get_api_url(method),
+					data=payload,
+					files={"document": (file_doc.file_name, f, mimetype or "application/octet-stream")},
+					timeout=DEFAULT_TIMEOUT,
+				)
+		else:
+			response = get_session().post(get_api_url(method), json=payload, timeout=DEFAULT_TIMEOUT)
+	except (requests.ConnectionError, requests.Timeout) as e:
+		raise RetryableError(str(e))
+
+	if response.status_code == 429:
+		retry_after = None
+		try:
+			retry_after = response.json().get("parameters", {}).get("retry_after")
+		except ValueError:
+			pass
+		raise RetryableError(response.text, retry_after=retry_after)
+
+	if response.status_code >= 500:
+		raise RetryableError(response.text)
+
+	response.raise_for_status()
+	return response.json()
+
+
+def backoff_delay(attempt):
+	return min(MAX_BACKOFF, 2**attempt) * random.uniform(0.5, 1)
+
+
+def get_rate_limit_wait(chat_id):
+	"""Take a token from the chat's bucket and the global one; return the seconds to wait if either is empty."""
+	if chat_id is not None:
+		wait = get_chat_bucket(chat_id).try_acquire()
+		if wait:
+			return wait
+	return get_global_bucket().try_acquire()
+
+
+def wait_for_rate_limit(chat_id):
+	get_global_bucket().acquire()
+	if chat_id is not None:
+		get_chat_bucket(chat_id).acquire()
+
+
+def get_global_bucket():
+	return TokenBucket("telegram|global", frappe.conf.get("telegram_global_rate") or GLOBAL_RATE)
+
+
+def get_chat_bucket(chat_id):
+	rate = GROUP_CHAT_RATE if str(chat_id).startswith("-") else PRIVATE_CHAT_RATE
+	return TokenBucket(f"telegram|chat|{chat_id}", rate, capacity=1)
+
+
+def dead_letter(method, payload, file_name, error):
+	frappe.log_error(
+		title="Telegram Dead Letter",
+		message=json.dumps(
+			{"method": method, "payload": payload, "file_name": file_name, "error": str(error)},
+			indent=1,
+			default=str,
+		),
+	)
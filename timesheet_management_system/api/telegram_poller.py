@@ -0,0 +1,96 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+from frappe.utils import cint
+
+from timesheet_management_system.api.telegram_bot import CommandContext, handle_update, parse_update
+from timesheet_management_system.api.telegram_client import get_api_url, get_session
+
+OFFSET_KEY = "telegram_update_offset"
+POLL_TIMEOUT = 30
+BATCH_SIZE = 100
+MAX_ERROR_BACKOFF = 60
+
+
+def run(max_batches=None):
+	"""Consume bot updates with getUpdates until interrupted, or for `max_batches` batches."""
+	if frappe.conf.get("telegram_update_mode") != "polling":
+		frappe.throw("Set telegram_update_mode to polling in site_config.json to use the polling worker")
+
+	# Telegram refuses getUpdates while a webhook is registered
+	get_session().post(get_api_url("deleteWebhook"), timeout=POLL_TIMEOUT)
+
+	site = frappe.local.site
+	workers = cint(frappe.conf.get("telegram_poll_workers")) or 4
+	offset = cint(frappe.db.get_global(OFFSET_KEY)) or None
+	errors = 0
+	batches = 0
+
+	with ThreadPoolExecutor(max_workers=workers, initializer=connect, initargs=(site,)) as pool:
+		while max_batches is None or batches < max_batches:
+			try:
+				updates = get_updates(offset)
+			except (requests.RequestException, ValueError) as e:
+				errors += 1
+				frappe.log_error(title="Telegram Polling", message=str(e))
+				time.sleep(min(MAX_ERROR_BACKOFF, 2**errors))
+				continue
+
+			errors = 0
+			batches += 1
+			if not updates:
+				continue
+
+			process_batch(updates, pool)
+			offset = max(u["update_id"] for u in updates) + 1
+			# only advance once the whole batch is handled, so a crash replays it instead of dropping it
+			frappe.db.set_global(OFFSET_KEY, offset)
+			frappe.db.commit()  # nosemgrep
+
+
+def get_updates(offset):
+	response = get_session().get(
+		get_api_url("getUpdates"),
+		params={
+			"offset": offset,
+			"timeout": POLL_TIMEOUT,
+			"limit": BATCH_SIZE,
+			"allowed_updates": '["message", "callback_query"]',
+		},
+		timeout=POLL_TIMEOUT + 10,
+	)
+	response.raise_for_status()
+	return response.json().get("result", [])
+
+
+def process_batch(updates, pool):
+	"""Load what the batch's commands need once, then handle the updates on the worker pool."""
+	clear_local_cache()
+	ctx = CommandContext(None, None)
+	ctx.preload(text for text, _ in map(parse_update, updates) if text)
+
+	for future in [pool.submit(process_update, update, ctx) for update in updates]:
+		future.result()
+
+
+def connect(site):
+	frappe.init(site=site)
+	frappe.connect()
+
+
+def clear_local_cache():
+	"""Drop the per-request cache that frappe.cache.hget fills, which this long-lived process never ends."""
+	frappe.local.cache = {}
+
+
+def process_update(update, ctx):
+	clear_local_cache()
+	try:
+		handle_update(update, ctx)
+		frappe.db.commit()  # nosemgrep
+	except Exception as e:
+		frappe.db.rollback()
+		frappe.log_error(title="Telegram Polling", message=f"Update {update.get('update_id')}: {e}")
+		frappe.db.commit()  # nosemgrep
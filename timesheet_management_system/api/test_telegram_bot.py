@@ -0,0 +1,117 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from timesheet_management_system.api.telegram_bot import (
+	COMMANDS,
+	CommandContext,
+	dispatch_command,
+	employee_id_command,
+)
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	write_rows,
+)
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup import (
+	refresh_rollup,
+)
+from timesheet_management_system.utils.metrics import count_queries
+
+# Most queries each command may issue with warm process caches (holiday bitmaps, employee index)
+QUERY_BUDGETS = {
+	"/employee": 1,
+	"/find": 0,
+	"/timesheet": 2,
+	"/weeklyhours": 3,
+	"/monthlyhours": 2,
+	"/yearhours": 2,
+	"/help": 0,
+}
+ID_LOOKUP_BUDGET = 1
+
+
+def make_employees(count):
+	company = frappe.db.get_value("Company", {}, "name")
+	gender = frappe.db.get_value("Gender", {}, "name")
+	return [
+		frappe.get_doc(
+			{
+				"doctype": "Employee",
+				"first_name": f"_Test Bot Employee {i}",
+				"gender": gender,
+				"date_of_birth": "1990-01-01",
+				"date_of_joining": "2020-01-01",
+				"company": company,
+				"status": "Active",
+			}
+		).insert()
+		for i in range(count)
+	]
+
+
+def make_ledger_rows(employees, days):
+	"""Filled, draft and leave days in turn, so every status branch of the commands is taken."""
+	rows = []
+	for i, employee in enumerate(employees):
+		for j, day in enumerate(days):
+			kind = (i + j) % 3
+			rows.append(
+				frappe._dict(
+					employee=employee.name,
+					employee_name=employee.employee_name,
+					date=day,
+					hours=8 if kind == 0 else 0,
+					timesheet=None,
+					is_filled=int(kind == 0),
+					is_draft=int(kind == 1),
+					on_leave=int(kind == 2),
+				)
+			)
+	write_rows(rows)
+
+
+class TestTelegramBotQueryCounts(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# rolled back with the rest of the test transaction in tearDownClass
+		cls.employees = make_employees(3)
+		today = date.today()
+		days = [today - timedelta(days=i) for i in range(7)]
+		make_ledger_rows(cls.employees, days)
+		for year, month in sorted({(day.year, day.month) for day in days}):
+			refresh_rollup(year, month, employees=[e.name for e in cls.employees])
+
+	def setUp(self):
+		# measure renders, not command cache hits, and keep every read on this connection
+		conf = patch.dict(frappe.local.conf, {"telegram_command_cache_ttl": 0, "read_from_replica": 0})
+		conf.start()
+		self.addCleanup(conf.stop)
+
+	def count(self, render):
+		render()  # warm the process caches
+		with count_queries() as queries:
+			render()
+		return queries.count
+
+	def test_every_command_has_a_budget(self):
+		self.assertEqual(set(COMMANDS), set(QUERY_BUDGETS))
+
+	def test_command_query_counts(self):
+		for name, budget in QUERY_BUDGETS.items():
+			text = f"{name} test" if name == "/find" else name
+			with self.subTest(command=name):
+				count = self.count(lambda text=text: dispatch_command(CommandContext(text, "1")))
+				self.assertLessEqual(count, budget)
+
+	def test_unknown_command_runs_no_queries(self):
+		self.assertEqual(self.count(lambda: dispatch_command(CommandContext("/unknown", "1"))), 0)
+
+	def test_employee_id_lookup_query_count(self):
+		employee = frappe._dict(name=self.employees[0].name, employee_name=self.employees[0].employee_name)
+		count = self.count(lambda: employee_id_command(CommandContext(employee.name, "1"), employee))
+		self.assertLessEqual(count, ID_LOOKUP_BUDGET)
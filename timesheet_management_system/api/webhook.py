@@ -1,11 +1,19 @@
 import frappe
-import requests
+from frappe.utils import get_url
+
+from timesheet_management_system.api.telegram_client import get_api_url, get_session
 
 
 def set_telegram_webhook():
-	bot_token = frappe.conf.get("telegram_bot_token")
-	site_url = "https://b17570e1a289.ngrok-free.app"
+	if frappe.conf.get("telegram_update_mode") == "polling":
+		frappe.throw("telegram_update_mode is polling, run bench telegram-poll instead of setting a webhook")
+
+	site_url = frappe.conf.get("telegram_webhook_base_url") or get_url()
 	webhook_url = f"{site_url}/api/method/timesheet_management_system.api.telegram_bot.telegram_webhook"
 
-	r = requests.get(f"https://api.telegram.org/bot{bot_token}/setWebhook?url={webhook_url}")
+	params = {"url": webhook_url, "allowed_updates": '["message", "callback_query"]'}
+	if secret := frappe.conf.get("telegram_webhook_secret"):
+		params["secret_token"] = secret
+
+	r = get_session().get(get_api_url("setWebhook"), params=params, timeout=30)
 	frappe.msgprint(str(r.json()))
@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import frappe
+
+from timesheet_management_system.utils.metrics import count_queries
+
+
+@contextmanager
+def rolled_back(name):
+	"""Run the block inside a savepoint that is always rolled back, so seeded data never persists."""
+	frappe.db.savepoint(name)
+	try:
+		yield
+	finally:
+		frappe.db.rollback(save_point=name)
+
+
+@contextmanager
+def uncached():
+	"""Measure the work, not the caches: no command cache and no replica routing."""
+	with patch.dict(frappe.local.conf, {"telegram_command_cache_ttl": 0, "read_from_replica": 0}):
+		yield
@@ -0,0 +1,168 @@
+"""
+Seeded synthetic data for the benchmark suite. Every record is prefixed with BENCH- so it can be
+cleared without touching real data.
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+
+import frappe
+from frappe.utils import getdate, now
+
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	rebuild_ledger,
+)
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup import (
+	rebuild_rollups,
+)
+
+PREFIX = "BENCH-"
+ACTIVITY_TYPES = ("Development", "Testing", "Planning", "Review", "Support")
+CHUNK_SIZE = 10000
+
+
+def seed(employees=1000, days=365, seed=42, fill_rate=0.9, leave_rate=0.03, details_per_day=2, to_date=None):
+	rng = random.Random(seed)
+	to_date = getdate(to_date) if to_date else date.today()
+	from_date = to_date - timedelta(days=days - 1)
+	timestamp = now()
+	company = frappe.db.get_value("Company", {}, "name")
+
+	employee_ids = [f"{PREFIX}EMP-{i:06d}" for i in range(employees)]
+	frappe.db.bulk_insert(
+		"Employee",
+		["name", "employee_name", "first_name", "status", "company", "creation", "modified"],
+		[
+			(e, f"Bench Employee {i}", f"Bench {i}", "Active", company, timestamp, timestamp)
+			for i, e in enumerate(employee_ids)
+		],
+		chunk_size=CHUNK_SIZE,
+	)
+
+	holidays = seed_holidays(rng, from_date, to_date, timestamp)
+	working_days = [
+		from_date + timedelta(days=offset)
+		for offset in range(days)
+		if (from_date + timedelta(days=offset)).weekday() < 5
+		and from_date + timedelta(days=offset) not in holidays
+	]
+
+	timesheets, details, leaves = [], [], []
+	for employee in employee_ids:
+		for day in working_days:
+			roll = rng.random()
+			if roll < leave_rate:
+				name = f"{PREFIX}LA-{employee}-{day}"
+				leaves.append((name, employee, day, day, "Approved", 1, timestamp, timestamp))
+			elif roll < leave_rate + fill_rate:
+				name = f"{PREFIX}TS-{employee}-{day}"
+				hours = [round(rng.uniform(1, 5), 2) for _ in range(details_per_day)]
+				timesheets.append((name, employee, day, day, sum(hours), 1, timestamp, timestamp))
+				for idx, h in enumerate(hours, 1):
+					details.append(
+						(
+							f"{name}-{idx}",
+							name,
+							"Timesheet",
+							"time_logs",
+							idx,
+							rng.choice(ACTIVITY_TYPES),
+							h,
+							datetime.combine(day, time(9)),
+							timestamp,
+							timestamp,
+						)
+					)
+
+		if len(details) >= CHUNK_SIZE:
+			flush(timesheets, details, leaves)
+
+	flush(timesheets, details, leaves)
+	rebuild_ledger(from_date, to_date)
+	rebuild_rollups(from_date, to_date)
+	frappe.db.commit()  # nosemgrep
+
+	return {
+		"employees": employees,
+		"from_date": str(from_date),
+		"to_date": str(to_date),
+		"working_days": len(working_days),
+	}
+
+
+def seed_holidays(rng, from_date, to_date, timestamp):
+	holidays = set()
+	for year in range(from_date.year, to_date.year + 1):
+		holiday_list = f"{PREFIX}Holidays-{year}"
+		frappe.db.bulk_insert(
+			"Holiday List",
+			["name", "holiday_list_name", "from_date", "to_date", "creation", "modified"],
+			[(holiday_list, holiday_list, date(year, 1, 1), date(year, 12, 31), timestamp, timestamp)],
+		)
+		weekdays = [
+			date(year, 1, 1) + timedelta(days=offset)
+			for offset in range((date(year + 1, 1, 1) - date(year, 1, 1)).days)
+			if (date(year, 1, 1) + timedelta(days=offset)).weekday() < 5
+		]
+		year_holidays = sorted(rng.sample(weekdays, 12))
+		frappe.db.bulk_insert(
+			"Holiday",
+			["name", "parent", "parenttype", "parentfield", "idx", "holiday_date", "description"],
+			[
+				(f"{holiday_list}-{idx}", holiday_list, "Holiday List", "holidays", idx, day, "Bench Holiday")
+				for idx, day in enumerate(year_holidays, 1)
+			],
+		)
+		holidays.update(year_holidays)
+	return holidays
+
+
+def flush(timesheets, details, leaves):
+	frappe.db.bulk_insert(
+		"Timesheet",
+		["name", "employee", "start_date", "end_date", "total_hours", "docstatus", "creation", "modified"],
+		timesheets,
+		chunk_size=CHUNK_SIZE,
+	)
+	frappe.db.bulk_insert(
+		"Timesheet Detail",
+		[
+			"name",
+			"parent",
+			"parenttype",
+			"parentfield",
+			"idx",
+			"activity_type",
+			"hours",
+			"from_time",
+			"creation",
+			"modified",
+		],
+		details,
+		chunk_size=CHUNK_SIZE,
+	)
+	frappe.db.bulk_insert(
+		"Leave Application",
+		["name", "employee", "from_date", "to_date", "status", "docstatus", "creation", "modified"],
+		leaves,
+		chunk_size=CHUNK_SIZE,
+	)
+	timesheets.clear()
+	details.clear()
+	leaves.clear()
+
+
+def clear():
+	for doctype, field in (
+		("Timesheet Detail", "parent"),
+		("Timesheet", "name"),
+		("Leave Application", "name"),
+		("Holiday", "parent"),
+		("Holiday List", "name"),
+		("Timesheet Compliance Ledger", "employee"),
+		("Timesheet Monthly Rollup", "employee"),
+		("Employee", "name"),
+	):
+		frappe.db.delete(doctype, {field: ["like", f"{PREFIX}%"]})
+	frappe.db.commit()  # nosemgrep
+	frappe.cache.delete_value("timesheet_working_days")
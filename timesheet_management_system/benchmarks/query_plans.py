@@ -0,0 +1,93 @@
+"""
+EXPLAIN every SELECT the app issues and report full scans of the hot tables.
+
+Run it against a site seeded with seed-timesheet-benchmark-data: on near-empty tables the optimizer
+prefers scans over perfectly good indexes, which is why scans below `min_rows` estimated rows pass.
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import frappe
+
+from timesheet_management_system.api import telegram_bot
+from timesheet_management_system.benchmarks import rolled_back, uncached
+from timesheet_management_system.benchmarks.suite import get_cases
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	refresh_ledger,
+)
+from timesheet_management_system.utils.compliance import get_compliance
+from timesheet_management_system.utils.working_days import build_year_bitmap
+
+CHECKED_TABLES = {
+	"tabTimesheet",
+	"tabTimesheet Detail",
+	"tabLeave Application",
+	"tabHoliday",
+	"tabTimesheet Compliance Ledger",
+}
+ALIAS_PATTERN = re.compile(r"`(tab[^`]+)`\s+(?:as\s+)?(\w+)", re.IGNORECASE)
+
+
+@contextmanager
+def capture_selects():
+	"""Collect the distinct SELECT statements (with their first set of values) issued while the block runs."""
+	queries = {}
+	original_sql = frappe.db.sql
+
+	def sql(query, values=(), *args, **kwargs):
+		text = str(query).strip()
+		if text[:6].lower() == "select":
+			queries.setdefault(text, values)
+		return original_sql(query, values, *args, **kwargs)
+
+	frappe.db.sql = sql
+	try:
+		yield queries
+	finally:
+		frappe.db.sql = original_sql
+
+
+def get_extra_cases():
+	"""Paths the benchmark suite does not reach: ledger refresh, holiday bitmaps and the sharded jobs."""
+	today = date.today()
+	start_of_week = today - timedelta(days=today.weekday())
+	return {
+		"ledger.refresh": lambda: refresh_ledger(today - timedelta(days=7), today),
+		"working_days.build_year_bitmap": lambda: build_year_bitmap(today.year),
+		"compliance.week": lambda: get_compliance(start_of_week, start_of_week + timedelta(days=4)),
+		"job.find_pending_employees": lambda: telegram_bot.find_pending_employees(today),
+	}
+
+
+def check(min_rows=1000):
+	with rolled_back("timesheet_query_plans"):
+		# a cached reply would hide the SELECTs behind it
+		with uncached(), capture_selects() as queries:
+			for fn in {**get_cases(), **get_extra_cases()}.values():
+				fn()
+
+		plans = []
+		for query, values in queries.items():
+			aliases = {alias: table for table, alias in ALIAS_PATTERN.findall(query)}
+			for step in frappe.db.sql(f"explain {query}", values, as_dict=True):
+				table = aliases.get(step.table, step.table)
+				if table not in CHECKED_TABLES and f"tab{table}" not in CHECKED_TABLES:
+					continue
+				plans.append(
+					frappe._dict(
+						query=" ".join(query.split())[:300],
+						table=table,
+						type=step.type,
+						key=step.key,
+						rows=step.rows,
+						full_scan=step.type == "ALL" and (step.rows or 0) >= min_rows,
+					)
+				)
+
+	return {
+		"checked": len(plans),
+		"full_scans": [plan for plan in plans if plan.full_scan],
+		"plans": plans,
+	}
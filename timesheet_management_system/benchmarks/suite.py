@@ -0,0 +1,153 @@
+"""
+Wall time, query count and peak Python memory of the app's hot paths, written as JSON so two commits
+can be compared on the same seeded data set.
+
+	bench --site <site> seed-timesheet-benchmark-data --employees 10000 --days 365
+	bench --site <site> run-timesheet-benchmarks --output head.json
+	bench --site <site> compare-timesheet-benchmarks base.json head.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import date
+
+import frappe
+
+from timesheet_management_system.api import telegram_bot
+from timesheet_management_system.benchmarks import count_queries, rolled_back, uncached
+from timesheet_management_system.benchmarks.data import PREFIX
+from timesheet_management_system.timesheet_management_system.report.employee_timesheet_report import (
+	employee_timesheet_report,
+)
+from timesheet_management_system.timesheet_management_system.report.team_timesheet_matrix import (
+	team_timesheet_matrix,
+)
+from timesheet_management_system.utils.compliance import get_compliance
+
+
+def measure(name, fn, repeat=3):
+	"""Run `fn` `repeat` times and keep the best wall time; query count and memory come from the first run."""
+	timings = []
+	queries = peak = None
+	for _ in range(repeat):
+		frappe.local.cache = {}
+		tracemalloc.start()
+		with count_queries() as counter:
+			started = time.perf_counter()
+			fn()
+			timings.append(time.perf_counter() - started)
+		_, run_peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		if queries is None:
+			queries, peak = counter.count, run_peak
+
+	return {
+		"name": name,
+		"wall_time_ms": round(min(timings) * 1000, 3),
+		"queries": queries,
+		"peak_memory_kb": round(peak / 1024, 1),
+	}
+
+
+def get_cases():
+	today = date.today()
+	employee = frappe.db.get_value("Employee", {"name": ["like", f"{PREFIX}%"]}, "name", order_by="name asc")
+	company = frappe.db.get_value("Employee", employee, "company") if employee else None
+
+	cases = {}
+	if employee:
+		cases["report.employee_timesheet_report"] = lambda: employee_timesheet_report.build_report(
+			employee, today.year, today.month
+		)
+		cases["bot.employee_id_lookup"] = lambda: telegram_bot.dispatch_command(
+			telegram_bot.CommandContext(employee, chat_id=0)
+		)
+	if company:
+		cases["report.team_timesheet_matrix"] = lambda: team_timesheet_matrix.execute(
+			frappe._dict(
+				company=company,
+				from_date=today.replace(day=1),
+				to_date=today,
+				page=1,
+				page_length=100,
+			)
+		)
+
+	for command in telegram_bot.COMMANDS:
+		cases[f"bot.{command.lstrip('/')}"] = lambda command=command: telegram_bot.dispatch_command(
+			telegram_bot.CommandContext(command, chat_id=0)
+		)
+
+	cases["compliance.year"] = lambda: get_compliance(today.replace(month=1, day=1), today).pending_counts()
+	# both steps of the sharded reminder in one process, over every active employee
+	cases["job.send_reminder"] = lambda: telegram_bot.merge_pending_names(
+		[telegram_bot.collect_pending_names(None, today)], None, today
+	)
+	cases["job.generate_csv_weekly_pending_report"] = generate_weekly_csv
+	return cases
+
+
+def generate_weekly_csv():
+	result = employee_timesheet_report.generate_csv_weekly_pending_report()
+	if result:
+		path = frappe.get_site_path(result["file_url"].lstrip("/"))
+		if os.path.exists(path):
+			os.remove(path)
+
+
+def run(output=None, repeat=3):
+	results = []
+	# nothing the measured code writes (Files, queued deliveries) outlives the run
+	with rolled_back("timesheet_benchmarks"), uncached():
+		for name, fn in get_cases().items():
+			results.append(measure(name, fn, repeat=repeat))
+
+	report = {
+		"commit": get_commit(),
+		"python": platform.python_version(),
+		"employees": frappe.db.count("Employee", {"status": "Active"}),
+		"timesheets": frappe.db.count("Timesheet"),
+		"results": results,
+	}
+
+	if output:
+		with open(output, "w") as f:
+			json.dump(report, f, indent=1)
+	return report
+
+
+def get_commit():
+	try:
+		return subprocess.check_output(
+			["git", "rev-parse", "HEAD"], cwd=frappe.get_app_path("timesheet_management_system"), text=True
+		).strip()
+	except Exception:
+		return None
+
+
+def compare(base, head):
+	"""Per-case ratio of head to base for each metric; above 1 means head is slower or heavier."""
+	with open(base) as f:
+		base_results = {r["name"]: r for r in json.load(f)["results"]}
+	with open(head) as f:
+		head_results = {r["name"]: r for r in json.load(f)["results"]}
+
+	rows = []
+	for name, result in head_results.items():
+		previous = base_results.get(name)
+		if not previous:
+			continue
+		rows.append(
+			{
+				"name": name,
+				**{
+					metric: round(result[metric] / previous[metric], 3) if previous[metric] else None
+					for metric in ("wall_time_ms", "queries", "peak_memory_kb")
+				},
+			}
+		)
+	return rows
@@ -0,0 +1,54 @@
+"""
+Query count of the weekly pending CSV as the number of employees grows.
+
+	bench --site <site> execute timesheet_management_system.benchmarks.weekly_pending_report.run
+"""
+
+from datetime import date, timedelta
+
+import frappe
+from frappe.utils import now
+
+from timesheet_management_system.benchmarks import count_queries, rolled_back
+from timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report import (
+	iter_weekly_pending_rows,
+)
+
+
+def run(sizes=(100, 1000, 5000)):
+	today = date.today()
+	start_of_week = today - timedelta(days=today.weekday())
+	end_of_week = start_of_week + timedelta(days=4)
+
+	results = []
+	for size in sizes:
+		with rolled_back("weekly_pending_benchmark"):
+			seed_week(size, start_of_week)
+			with count_queries() as queries:
+				employees = frappe.get_all(
+					"Employee", filters={"status": "Active"}, fields=["name", "employee_name"]
+				)
+				rows = sum(1 for _ in iter_weekly_pending_rows(employees, start_of_week, end_of_week))
+			results.append({"employees": size, "queries": queries.count, "pending_rows": rows})
+
+	return results
+
+
+def seed_week(size, start_of_week):
+	"""Insert `size` active employees, each with every other weekday of the week filled in the ledger."""
+	timestamp = now()
+	employees = [f"BENCH-EMP-{i:06d}" for i in range(size)]
+	frappe.db.bulk_insert(
+		"Employee",
+		["name", "employee_name", "first_name", "status", "creation", "modified"],
+		[(e, e, e, "Active", timestamp, timestamp) for e in employees],
+	)
+	frappe.db.bulk_insert(
+		"Timesheet Compliance Ledger",
+		["name", "employee", "employee_name", "date", "status", "hours", "is_filled", "creation", "modified"],
+		[
+			(f"{e}-{day}", e, e, day, "Filled", 8, 1, timestamp, timestamp)
+			for e in employees
+			for day in (start_of_week + timedelta(days=offset) for offset in range(0, 5, 2))
+		],
+	)
@@ -0,0 +1,164 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-timesheet-ledger")
+@click.option("--from-date", required=True, help="First date to rebuild (YYYY-MM-DD)")
+@click.option("--to-date", required=True, help="Last date to rebuild (YYYY-MM-DD)")
+@pass_context
+def rebuild_timesheet_ledger(context, from_date, to_date):
+	"Rebuild the Timesheet Compliance Ledger from Timesheets and Leave Applications"
+	import frappe
+
+	from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+		rebuild_ledger,
+	)
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_ledger(from_date, to_date)
+	finally:
+		frappe.destroy()
+
+
+@click.command("rebuild-timesheet-rollups")
+@click.option("--from-date", required=True, help="First month to rebuild, any date in it (YYYY-MM-DD)")
+@click.option("--to-date", required=True, help="Last month to rebuild, any date in it (YYYY-MM-DD)")
+@pass_context
+def rebuild_timesheet_rollups(context, from_date, to_date):
+	"Rebuild the Timesheet Monthly Rollup from the compliance ledger, run after rebuild-timesheet-ledger"
+	import frappe
+
+	from timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup import (
+		rebuild_rollups,
+	)
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_rollups(from_date, to_date)
+	finally:
+		frappe.destroy()
+
+
+@click.command("seed-timesheet-benchmark-data")
+@click.option("--employees", default=1000, help="Number of synthetic employees")
+@click.option("--days", default=365, help="Number of days of history, ending today")
+@click.option("--seed", default=42, help="Random seed, keep it fixed to compare commits")
+@pass_context
+def seed_timesheet_benchmark_data(context, employees, days, seed):
+	"Insert BENCH- prefixed Employees, Timesheets, Leave Applications and Holidays"
+	import frappe
+
+	from timesheet_management_system.benchmarks import data
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		click.echo(frappe.as_json(data.seed(employees=employees, days=days, seed=seed)))
+	finally:
+		frappe.destroy()
+
+
+@click.command("clear-timesheet-benchmark-data")
+@pass_context
+def clear_timesheet_benchmark_data(context):
+	"Delete every BENCH- prefixed record inserted by seed-timesheet-benchmark-data"
+	import frappe
+
+	from timesheet_management_system.benchmarks import data
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		data.clear()
+	finally:
+		frappe.destroy()
+
+
+@click.command("run-timesheet-benchmarks")
+@click.option("--output", help="Write the results as JSON to this file")
+@click.option("--repeat", default=3, help="Runs per case, the best wall time is kept")
+@pass_context
+def run_timesheet_benchmarks(context, output, repeat):
+	"Measure wall time, query count and peak memory of the report, bot commands and scheduled jobs"
+	import frappe
+
+	from timesheet_management_system.benchmarks import suite
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		click.echo(frappe.as_json(suite.run(output=output, repeat=repeat)))
+	finally:
+		frappe.destroy()
+
+
+@click.command("compare-timesheet-benchmarks")
+@click.argument("base")
+@click.argument("head")
+def compare_timesheet_benchmarks(base, head):
+	"Print head/base ratios for two run-timesheet-benchmarks result files"
+	import json
+
+	from timesheet_management_system.benchmarks import suite
+
+	click.echo(json.dumps(suite.compare(base, head), indent=1))
+
+
+@click.command("check-timesheet-query-plans")
+@click.option(
+	"--min-rows", default=1000, help="Ignore full scans the optimizer estimates below this many rows"
+)
+@click.option("--verbose", is_flag=True, help="Print every checked plan, not just the full scans")
+@pass_context
+def check_timesheet_query_plans(context, min_rows, verbose):
+	"EXPLAIN every query the app issues and fail if one full-scans Timesheet, Leave, Holiday or the ledger"
+	import sys
+
+	import frappe
+
+	from timesheet_management_system.benchmarks import query_plans
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		result = query_plans.check(min_rows=min_rows)
+	finally:
+		frappe.destroy()
+
+	if not verbose:
+		result.pop("plans")
+	click.echo(frappe.as_json(result))
+	if result["full_scans"]:
+		sys.exit(1)
+
+
+@click.command("telegram-poll")
+@click.option("--max-batches", type=int, help="Stop after this many getUpdates calls")
+@pass_context
+def telegram_poll(context, max_batches):
+	"Consume Telegram bot updates with long polling instead of the webhook"
+	import frappe
+
+	from timesheet_management_system.api import telegram_poller
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		telegram_poller.run(max_batches=max_batches)
+	finally:
+		frappe.destroy()
+
+
+commands = [
+	rebuild_timesheet_ledger,
+	rebuild_timesheet_rollups,
+	seed_timesheet_benchmark_data,
+	clear_timesheet_benchmark_data,
+	run_timesheet_benchmarks,
+	compare_timesheet_benchmarks,
+	check_timesheet_query_plans,
+	telegram_poll,
+]
@@ -86,7 +86,8 @@ app_license = "mit"
 # ------------
 
 # before_install = "timesheet_management_system.install.before_install"
-# after_install = "timesheet_management_system.install.after_install"
+after_install = "timesheet_management_system.install.after_install"
+after_migrate = "timesheet_management_system.install.after_migrate"
 
 # Uninstallation
 # ------------
@@ -140,6 +141,55 @@ app_license = "mit"
 # 	}
 # }
 
+LEDGER_EVENTS = "timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger"
+COMMAND_CACHE_EVENTS = "timesheet_management_system.api.command_cache"
+COMPLIANCE_EVENTS = "timesheet_management_system.api.compliance_events"
+ROLLUP_EVENTS = "timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup"
+REPORT_EVENTS = "timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report"
+
+TIMESHEET_HANDLERS = [
+	f"{LEDGER_EVENTS}.on_timesheet_change",
+	f"{REPORT_EVENTS}.on_timesheet_change",
+	f"{COMMAND_CACHE_EVENTS}.on_timesheet_change",
+]
+# the rollup and the realtime deltas only count submitted Timesheets and read the ledger, so they run
+# after the ledger handler
+TIMESHEET_SUBMIT_HANDLERS = [
+	*TIMESHEET_HANDLERS[:1],
+	f"{ROLLUP_EVENTS}.on_timesheet_change",
+	*TIMESHEET_HANDLERS[1:],
+	f"{COMPLIANCE_EVENTS}.on_timesheet_change",
+]
+HOLIDAY_LIST_HANDLERS = [
+	"timesheet_management_system.utils.working_days.clear_cache",
+	f"{REPORT_EVENTS}.on_holiday_list_change",
+	f"{COMMAND_CACHE_EVENTS}.on_holiday_list_change",
+]
+
+doc_events = {
+	"Timesheet": {
+		"on_update": TIMESHEET_HANDLERS,
+		"on_submit": TIMESHEET_SUBMIT_HANDLERS,
+		"on_cancel": TIMESHEET_SUBMIT_HANDLERS,
+		"after_delete": TIMESHEET_HANDLERS,
+	},
+	"Leave Application": {
+		"on_update": f"{LEDGER_EVENTS}.on_leave_application_change",
+		"on_submit": f"{LEDGER_EVENTS}.on_leave_application_change",
+		"on_cancel": f"{LEDGER_EVENTS}.on_leave_application_change",
+		"after_delete": f"{LEDGER_EVENTS}.on_leave_application_change",
+	},
+	"Holiday List": {
+		"on_update": HOLIDAY_LIST_HANDLERS,
+		"after_delete": HOLIDAY_LIST_HANDLERS,
+	},
+	"Employee": {
+		"after_insert": [f"{LEDGER_EVENTS}.on_employee_insert", f"{COMMAND_CACHE_EVENTS}.on_employee_change"],
+		"on_update": f"{COMMAND_CACHE_EVENTS}.on_employee_change",
+		"after_delete": f"{COMMAND_CACHE_EVENTS}.on_employee_change",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -165,8 +215,14 @@ scheduler_events = {
 		"00 09 * * FRI": [
 			"timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report.send_weekly_timesheet_report"
 		],
+		"00 09 * * MON-THU": [
+			"timesheet_management_system.api.pending_report_delta.send_daily_pending_report_delta"
+		],
 		"0 18 * * *": ["timesheet_management_system.api.telegram_bot.send_reminder"],
 		"0 11 * * *": ["timesheet_management_system.api.telegram_bot.send_daily_reminders"],
+		"30 01 * * *": [f"{REPORT_EVENTS}.prewarm_report_cache"],
+		"15 01 * * *": [f"{ROLLUP_EVENTS}.close_rollups"],
+		"* * * * *": [f"{COMPLIANCE_EVENTS}.send_compliance_digest"],
 	}
 }
 # Testing
@@ -0,0 +1,40 @@
+import frappe
+from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+CUSTOM_FIELDS = {
+	"Employee": [
+		{
+			"fieldname": "telegram_chat_id",
+			"fieldtype": "Data",
+			"label": "Telegram Chat ID",
+			"insert_after": "cell_number",
+			"description": "Private chat with the timesheet bot, used for direct reminders.",
+		},
+	],
+}
+
+# Composite indexes behind the ledger refresh, reminder and report queries on core/HRMS tables
+INDEXES = {
+	"Timesheet": [["start_date", "docstatus", "employee"]],
+	"Leave Application": [["from_date", "to_date"]],
+	"Holiday": [["holiday_date", "parent"]],
+	"Timesheet Detail": [["parent", "activity_type", "task", "hours"]],
+}
+
+
+def after_install():
+	create_custom_fields(CUSTOM_FIELDS, update=True)
+	# patches are only marked as done on install, so the indexes are created here too
+	add_indexes()
+
+
+def after_migrate():
+	create_custom_fields(CUSTOM_FIELDS, update=True)
+
+
+def add_indexes():
+	for doctype, indexes in INDEXES.items():
+		if not frappe.db.table_exists(doctype):
+			continue
+		for fields in indexes:
+			frappe.db.add_index(doctype, fields)
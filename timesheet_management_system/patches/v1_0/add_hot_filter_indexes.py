@@ -0,0 +1,5 @@
+from timesheet_management_system.install import add_indexes
+
+
+def execute():
+	add_indexes()
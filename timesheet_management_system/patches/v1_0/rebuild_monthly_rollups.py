@@ -0,0 +1,11 @@
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	get_history_range,
+)
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup import (
+	rebuild_rollups,
+)
+
+
+def execute():
+	# runs after the ledger backfill, which the rollups are derived from, over the same months
+	rebuild_rollups(*get_history_range())
@@ -0,0 +1,229 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+from datetime import date, timedelta
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import getdate, now
+
+LEDGER = "Timesheet Compliance Ledger"
+LEDGER_FIELDS = [
+	"name",
+	"employee",
+	"employee_name",
+	"date",
+	"status",
+	"hours",
+	"timesheet",
+	"is_filled",
+	"is_draft",
+	"on_leave",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+]
+READ_FIELDS = [
+	"employee",
+	"date",
+	"status",
+	"hours",
+	"timesheet",
+	"is_filled",
+	"is_draft",
+	"on_leave",
+]
+
+
+class TimesheetComplianceLedger(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index(LEDGER, ["employee", "date"])
+	frappe.db.add_index(LEDGER, ["date", "status"])
+
+
+def get_status(row):
+	if row.get("is_filled"):
+		return "Filled"
+	if row.get("is_draft"):
+		return "Draft"
+	if row.get("on_leave"):
+		return "Leave"
+
+
+def get_ledger(from_date, to_date=None, employee=None, fields=None):
+	"""Ledger rows for a date or range; working days without a row are pending."""
+	filters = {"date": ["between", [from_date, to_date]] if to_date else from_date}
+	if employee:
+		filters["employee"] = employee
+
+	return frappe.get_all(
+		LEDGER,
+		filters=filters,
+		fields=fields or READ_FIELDS,
+		order_by="date asc",
+	)
+
+
+def refresh_ledger(from_date, to_date, employees=None):
+	"""Recompute ledger rows from Timesheet and Leave Application for the given range."""
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	employee_filter = {"employee": ["in", employees]} if employees else {}
+
+	active_employees = frappe.get_all(
+		"Employee",
+		filters={"status": "Active", **({"name": ["in", employees]} if employees else {})},
+		fields=["name", "employee_name"],
+	)
+	employee_names = {e.name: e.employee_name for e in active_employees}
+
+	timesheets = frappe.get_all(
+		"Timesheet",
+		filters={
+			"start_date": ["between", [from_date, to_date]],
+			"docstatus": ["<", 2],
+			**employee_filter,
+		},
+		fields=["name", "employee", "employee_name", "start_date", "total_hours", "docstatus"],
+	)
+	leaves = frappe.get_all(
+		"Leave Application",
+		filters={
+			"from_date": ["<=", to_date],
+			"to_date": [">=", from_date],
+			"docstatus": ["<", 2],
+			**employee_filter,
+		},
+		fields=["employee", "employee_name", "from_date", "to_date"],
+	)
+
+	rows = {}
+
+	def get_row(employee, day, employee_name=None):
+		key = (employee, day)
+		if key not in rows:
+			rows[key] = frappe._dict(
+				employee=employee,
+				employee_name=employee_name or employee_names.get(employee),
+				date=day,
+				hours=0,
+				timesheet=None,
+				is_filled=0,
+				is_draft=0,
+				on_leave=0,
+			)
+		return rows[key]
+
+	for t in timesheets:
+		row = get_row(t.employee, t.start_date, t.employee_name)
+		if t.docstatus == 1:
+			row.is_filled = 1
+			row.hours += t.total_hours or 0
+			row.timesheet = t.name
+		else:
+			row.is_draft = 1
+
+	for la in leaves:
+		current = max(getdate(la.from_date), from_date)
+		last = min(getdate(la.to_date), to_date)
+		while current <= last:
+			get_row(la.employee, current, la.employee_name).on_leave = 1
+			current += timedelta(days=1)
+
+	frappe.db.delete(LEDGER, {"date": ["between", [from_date, to_date]], **employee_filter})
+	write_rows(rows.values())
+
+
+def write_rows(rows):
+	timestamp = now()
+	user = frappe.session.user
+	values = [
+		(
+			f"{row.employee}-{row.date}",
+			row.employee,
+			row.employee_name,
+			row.date,
+			get_status(row),
+			row.hours,
+			row.timesheet,
+			row.is_filled,
+			row.is_draft,
+			row.on_leave,
+			timestamp,
+			timestamp,
+			user,
+			user,
+		)
+		for row in rows
+	]
+	if values:
+		frappe.db.bulk_insert(LEDGER, LEDGER_FIELDS, values, chunk_size=5000)
+
+
+def on_timesheet_change(doc, method=None):
+	affected = {(doc.employee, doc.start_date)}
+	before = doc.get_doc_before_save()
+	if before:
+		affected.add((before.employee, before.start_date))
+
+	for employee, day in affected:
+		if employee and day:
+			refresh_ledger(day, day, employees=[employee])
+
+
+def on_leave_application_change(doc, method=None):
+	ranges = [(doc.employee, doc.from_date, doc.to_date)]
+	before = doc.get_doc_before_save()
+	if before:
+		ranges.append((before.employee, before.from_date, before.to_date))
+
+	for employee, from_date, to_date in ranges:
+		if employee and from_date and to_date:
+			refresh_ledger(from_date, to_date, employees=[employee])
+
+
+def on_employee_insert(doc, method=None):
+	if doc.status == "Active":
+		refresh_ledger(*get_history_range([doc.name]), employees=[doc.name])
+
+
+def get_history_range(employees=None):
+	"""From the earliest Timesheet or Leave Application (at the latest Jan 1) to the end of this year."""
+	employee_filter = {"employee": ["in", employees]} if employees else {}
+	year = date.today().year
+	starts = [
+		frappe.db.get_value("Timesheet", {"docstatus": ["<", 2], **employee_filter}, "min(start_date)"),
+		frappe.db.get_value(
+			"Leave Application", {"docstatus": ["<", 2], **employee_filter}, "min(from_date)"
+		),
+		date(year, 1, 1),
+	]
+	return min(getdate(start) for start in starts if start), date(year, 12, 31)
+
+
+@frappe.whitelist()
+def rebuild_ledger(from_date, to_date):
+	"""Rebuild the ledger month by month so large backfills keep memory bounded."""
+	frappe.only_for("System Manager")
+
+	current = getdate(from_date)
+	to_date = getdate(to_date)
+	while current <= to_date:
+		next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+		refresh_ledger(current, min(to_date, next_month - timedelta(days=1)))
+		clear_cached_reports([(current.year, current.month)])
+		frappe.db.commit()  # nosemgrep
+		current = next_month
+
+
+def clear_cached_reports(months):
+	"""Drop Employee Timesheet Report cache entries built from ledger rows that were just rewritten."""
+	# imported here: the report module reaches this one through utils.compliance
+	from timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report import (
+		clear_report_cache,
+	)
+
+	clear_report_cache(months)
@@ -0,0 +1,140 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+import calendar
+from datetime import date, timedelta
+
+import frappe
+import numpy as np
+from frappe.model.document import Document
+from frappe.utils import getdate, now
+
+from timesheet_management_system.api.command_cache import bump
+from timesheet_management_system.utils.compliance import get_compliance
+
+ROLLUP = "Timesheet Monthly Rollup"
+ROLLUP_FIELDS = [
+	"name",
+	"employee",
+	"employee_name",
+	"year",
+	"month",
+	"total_hours",
+	"filled_days",
+	"pending_days",
+	"is_closed",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+]
+
+
+class TimesheetMonthlyRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index(ROLLUP, ["year", "month", "employee"])
+	frappe.db.add_index(ROLLUP, ["employee", "year"])
+
+
+def refresh_rollup(year, month, employees=None):
+	"""Recompute one month of rollup rows from the ledger, counting pending days up to today."""
+	first = date(year, month, 1)
+	last = date(year, month, calendar.monthrange(year, month)[1])
+	today = date.today()
+	if first > today:
+		return
+
+	filters = {"status": "Active"}
+	if employees:
+		filters["name"] = ["in", employees]
+	names = dict(frappe.get_all("Employee", filters=filters, fields=["name", "employee_name"], as_list=True))
+
+	# days after today are not pending yet
+	matrix = get_compliance(first, min(last, today), list(names))
+	filled_days = np.count_nonzero(matrix.filled, axis=1).tolist()
+	pending_days = matrix.pending_counts()
+	total_hours = matrix.total_hours()
+	is_closed = int(last < today)
+
+	timestamp = now()
+	user = frappe.session.user
+	values = [
+		(
+			f"{employee}-{year}-{month}",
+			employee,
+			names[employee],
+			year,
+			month,
+			total_hours[employee],
+			filled_days[i],
+			pending_days[employee],
+			is_closed,
+			timestamp,
+			timestamp,
+			user,
+			user,
+		)
+		for i, employee in enumerate(matrix.employees)
+	]
+
+	delete_filters = {"year": year, "month": month}
+	if employees:
+		delete_filters["employee"] = ["in", employees]
+	frappe.db.delete(ROLLUP, delete_filters)
+	if values:
+		frappe.db.bulk_insert(ROLLUP, ROLLUP_FIELDS, values, chunk_size=5000)
+
+
+def on_timesheet_change(doc, method=None):
+	"""Runs after the ledger handler, so the ledger already reflects this Timesheet."""
+	affected = {(doc.employee, getdate(doc.start_date))}
+	before = doc.get_doc_before_save()
+	if before and before.start_date:
+		affected.add((before.employee, getdate(before.start_date)))
+
+	for employee, day in affected:
+		if employee and day:
+			refresh_rollup(day.year, day.month, employees=[employee])
+
+
+def close_rollups():
+	frappe.enqueue(
+		"timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup.refresh_open_months",
+		queue="long",
+	)
+
+
+def refresh_open_months():
+	"""Nightly: recompute every open month and close the ones that have ended."""
+	today = date.today()
+	months = {(today.year, today.month)}
+	months |= set(
+		frappe.get_all(
+			ROLLUP,
+			filters={"is_closed": 0},
+			fields=["year", "month"],
+			distinct=True,
+			as_list=True,
+		)
+	)
+	for year, month in sorted(months):
+		refresh_rollup(year, month)
+		frappe.db.commit()  # nosemgrep
+
+	bump("timesheets")
+
+
+@frappe.whitelist()
+def rebuild_rollups(from_date, to_date):
+	"""Backfill rollup rows month by month, e.g. after rebuild_ledger."""
+	frappe.only_for("System Manager")
+
+	current = getdate(from_date).replace(day=1)
+	to_date = getdate(to_date)
+	while current <= to_date:
+		refresh_rollup(current.year, current.month)
+		frappe.db.commit()  # nosemgrep
+		current = (current + timedelta(days=32)).replace(day=1)
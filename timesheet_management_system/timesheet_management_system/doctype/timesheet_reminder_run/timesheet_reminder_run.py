@@ -0,0 +1,8 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+from frappe.model.document import Document
+
+
+class TimesheetReminderRun(Document):
+	pass
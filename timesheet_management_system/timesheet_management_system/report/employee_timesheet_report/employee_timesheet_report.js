@@ -39,4 +39,40 @@ frappe.query_reports["Employee Timesheet Report"] = {
 			default: new Date().getFullYear(),
 		},
 	],
+	tree: true,
+	name_field: "name",
+	parent_field: "parent_date",
+	initial_depth: 0,
+
+	onload(report) {
+		// Timesheet submits and cancels are pushed to the user's room as they happen, so the report never needs a re-run
+		frappe.realtime.off("timesheet_compliance");
+		frappe.realtime.on("timesheet_compliance", (delta) => apply_compliance_delta(report, delta));
+	},
 };
+
+function apply_compliance_delta(report, delta) {
+	const filters = report.get_values() || {};
+	if (delta.employee !== filters.employee || !report.data) return;
+
+	const row = report.data.find((r) => r.name === delta.date);
+	if (!row || ["Holiday", "Weekend"].includes(row.status)) return;
+
+	row.status = delta.status === "Filled" ? "Filled" : "Pending";
+	row.hours = delta.hours;
+	// the per-activity breakdown is stale; it comes back with the next run
+	row.task = row.activity_type = "";
+	report.data = report.data.filter((r) => r.parent_date !== delta.date);
+
+	report.datatable.refresh(report.data, report.columns);
+	const day_rows = report.data.filter((r) => !r.indent);
+	const totals = {
+		[__("Total Hours")]: day_rows.reduce((total, r) => total + (r.hours || 0), 0),
+		[__("Pending Days")]: day_rows.filter((r) => r.status === "Pending").length,
+	};
+	report.render_summary(
+		(report.raw_data.report_summary || []).map((item) =>
+			item.label in totals ? { ...item, value: totals[item.label] } : item
+		)
+	);
+}
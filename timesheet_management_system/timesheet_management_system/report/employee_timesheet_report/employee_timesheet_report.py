@@ -1,11 +1,22 @@
 import calendar
 import csv
+import gzip
+import hashlib
 import io
+import os
 from datetime import date, timedelta
 
 import frappe
-import requests
+import numpy as np
 from frappe import _
+from frappe.utils import cint, flt, getdate
+
+from timesheet_management_system.api.telegram_client import enqueue_document
+from timesheet_management_system.utils.cache import clear_now_and_after_commit
+from timesheet_management_system.utils.compliance import get_compliance
+from timesheet_management_system.utils.metrics import instrument
+from timesheet_management_system.utils.replica import primary, read_only, replica
+from timesheet_management_system.utils.sharding import fan_out
 
 
 def execute(filters=None):
@@ -19,64 +30,80 @@ def execute(filters=None):
 	if not (employee and month and year):
 		frappe.throw(_("Please select Employee, Month, and Year"))
 
-	start_date = date(year, month, 1)
-	end_date = date(year, month, calendar.monthrange(year, month)[1])
+	return get_cached_report(employee, year, month)
 
-	holiday_lists = frappe.get_all(
-		"Holiday List",
-		filters={"from_date": [">=", f"{year}-01-01"], "to_date": ["<=", f"{year}-12-31"]},
-		fields=["name"],
-	)
 
-	holiday_names = [h.name for h in holiday_lists]
+REPORT_CACHE_KEY = "employee_timesheet_report"
+# months still being filled in expire daily; the nightly prewarm fills the current one again
+OPEN_MONTH_TTL = 24 * 60 * 60
+CLOSED_MONTH_TTL = 30 * 24 * 60 * 60
 
-	holiday_records = frappe.get_all(
-		"Holiday", filters={"parent": ["in", holiday_names]}, fields=["holiday_date"]
-	)
 
-	holiday_dates = {h.holiday_date for h in holiday_records if h.holiday_date}
+def get_report_cache_key(year, month):
+	return f"{REPORT_CACHE_KEY}|{year}-{month:02d}"
 
-	timesheets = frappe.db.get_all(
-		"Timesheet",
-		filters={"employee": employee, "start_date": ["between", [start_date, end_date]], "docstatus": 1},
-		fields=["name", "start_date", "total_hours"],
-	)
 
-	timesheet_details = frappe.db.get_all(
-		"Timesheet Detail",
-		filters={"parent": ["in", [t.name for t in timesheets]]},
-		fields=["parent", "activity_type", "task"],
-	)
+def get_cached_report(employee, year, month):
+	"""Report cached per (employee, year, month)."""
+	cache_key = get_report_cache_key(year, month)
+	field = f"{employee}|{frappe.local.lang}"
 
-	task_map = {}
-	for d in timesheet_details:
-		task_map[d.parent] = {"task": d.task, "activity_type": d.activity_type}
+	result = frappe.cache.hget(cache_key, field)
+	if result is not None:
+		frappe.cache.incr(frappe.cache.make_key(f"{REPORT_CACHE_KEY}|hits"))
+		return result
+
+	frappe.cache.incr(frappe.cache.make_key(f"{REPORT_CACHE_KEY}|misses"))
+	with primary():
+		result = build_report(employee, year, month)
+	frappe.cache.hset(cache_key, field, result)
+	month_over = date(year, month, calendar.monthrange(year, month)[1]) < date.today()
+	frappe.cache.expire(frappe.cache.make_key(cache_key), CLOSED_MONTH_TTL if month_over else OPEN_MONTH_TTL)
+	return result
 
-	data_by_date = {
-		t.start_date: {"hours": t.total_hours, **task_map.get(t.name, {})} for t in timesheets if t.start_date
-	}
+
+def build_report(employee, year, month):
+	start_date = date(year, month, 1)
+	end_date = date(year, month, calendar.monthrange(year, month)[1])
+
+	matrix = get_compliance(start_date, end_date, [employee])
+	breakdown = get_activity_breakdown(employee, start_date, end_date)
+
+	statuses = np.select(
+		[matrix.holiday, matrix.filled[0], matrix.weekday],
+		["Holiday", "Filled", "Pending"],
+		"Weekend",
+	).tolist()
+	# a Timesheet on a holiday shows as Holiday and, as before the ledger, adds no hours
+	hours = matrix.hours[0] * matrix.filled[0] * ~matrix.holiday
 
 	data = []
-	total_hours = 0
-	pending_dates = []
-	holiday_count = 0
-
-	current = start_date
-	while current <= end_date:
-		if current in holiday_dates:
-			data.append([current, 0, "", "", "Holiday"])
-			holiday_count += 1
-		elif current in data_by_date:
-			entry = data_by_date[current]
-			hours = entry.get("hours", 0)
-			task = entry.get("task", "")
-			activity = entry.get("activity_type", "")
-			data.append([current, hours, task, activity, "Filled"])
-			total_hours += hours
-		else:
-			data.append([current, 0, "", "", "Pending"])
-			pending_dates.append(current)
-		current += timedelta(days=1)
+	for current, status, day_hours in zip(matrix.days.tolist(), statuses, hours.tolist(), strict=True):
+		row = {
+			"name": str(current),
+			"date": current,
+			"hours": day_hours,
+			"task": "",
+			"activity_type": "",
+			"indent": 0,
+			"status": status,
+		}
+		entries = breakdown.get(current, []) if status == "Filled" else []
+		if len(entries) == 1:
+			row.update(task=entries[0].task or "", activity_type=entries[0].activity_type or "")
+		data.append(row)
+		if len(entries) > 1:
+			data.extend(
+				{
+					"name": f"{current}|{idx}",
+					"parent_date": str(current),
+					"hours": entry.hours,
+					"task": entry.task or "",
+					"activity_type": entry.activity_type or "",
+					"indent": 1,
+				}
+				for idx, entry in enumerate(entries)
+			)
 
 	columns = [
 		{"label": _("Date"), "fieldname": "date", "fieldtype": "Date", "width": 120},
@@ -87,98 +114,273 @@ def execute(filters=None):
 	]
 
 	summary = [
-		{"label": _("Total Hours"), "value": total_hours, "indicator": "Blue"},
-		{"label": _("Pending Days"), "value": len(pending_dates), "indicator": "Red"},
-		{"label": _("Holidays"), "value": holiday_count, "indicator": "Green"},
+		{"label": _("Total Hours"), "value": float(hours.sum()), "indicator": "Blue"},
+		{"label": _("Pending Days"), "value": matrix.pending_counts()[employee], "indicator": "Red"},
+		{"label": _("Holidays"), "value": int(matrix.holiday.sum()), "indicator": "Green"},
 	]
 
 	return columns, data, None, None, summary
 
 
+def get_activity_breakdown(employee, start_date, end_date):
+	"""Submitted hours per day, activity type and task, summed in the database rather than per detail row."""
+	rows = frappe.db.sql(
+		"""
+		select ts.start_date as date, td.activity_type, td.task, sum(td.hours) as hours
+		from `tabTimesheet Detail` td
+		inner join `tabTimesheet` ts on ts.name = td.parent and td.parenttype = 'Timesheet'
+		where ts.employee = %(employee)s
+			and ts.docstatus = 1
+			and ts.start_date between %(start_date)s and %(end_date)s
+		group by ts.start_date, td.activity_type, td.task
+		order by ts.start_date, hours desc
+		""",
+		{"employee": employee, "start_date": start_date, "end_date": end_date},
+		as_dict=True,
+	)
+
+	breakdown = {}
+	for row in rows:
+		breakdown.setdefault(row.date, []).append(row)
+	return breakdown
+
+
+def clear_report_cache(months, employee=None):
+	def clear():
+		for year, month in months:
+			if employee:
+				fields = [
+					key
+					for key in frappe.cache.hkeys(get_report_cache_key(year, month))
+					if frappe.safe_decode(key).startswith(f"{employee}|")
+				]
+				if fields:
+					frappe.cache.hdel(get_report_cache_key(year, month), fields)
+			else:
+				frappe.cache.delete_value(get_report_cache_key(year, month))
+
+	clear_now_and_after_commit(clear)
+
+
+def on_timesheet_change(doc, method=None):
+	dates = [(doc.employee, doc.start_date)]
+	before = doc.get_doc_before_save()
+	if before:
+		dates.append((before.employee, before.start_date))
+
+	for employee, day in dates:
+		if employee and day:
+			day = getdate(day)
+			clear_report_cache([(day.year, day.month)], employee=employee)
+
+
+def on_holiday_list_change(doc, method=None):
+	dates = {getdate(h.holiday_date) for h in doc.get("holidays", [])}
+	before = doc.get_doc_before_save()
+	if before:
+		old_dates = {getdate(h.holiday_date) for h in before.get("holidays", [])}
+		dates = dates ^ old_dates if method == "on_update" else dates | old_dates
+
+	clear_report_cache({(day.year, day.month) for day in dates})
+
+
 @frappe.whitelist()
-def generate_csv_weekly_pending_report():
+def get_report_cache_stats():
+	frappe.only_for("System Manager")
+	hits = cint(frappe.cache.get(frappe.cache.make_key(f"{REPORT_CACHE_KEY}|hits")))
+	misses = cint(frappe.cache.get(frappe.cache.make_key(f"{REPORT_CACHE_KEY}|misses")))
+	return {
+		"hits": hits,
+		"misses": misses,
+		"hit_ratio": flt(hits / (hits + misses), 3) if hits + misses else 0,
+	}
+
+
+def prewarm_report_cache():
+	if not frappe.conf.get("employee_timesheet_report_prewarm"):
+		return
+
+	frappe.enqueue(
+		"timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report.prewarm_current_month",
+		queue="long",
+	)
+
+
+@instrument("job.prewarm_report_cache")
+def prewarm_current_month():
 	today = date.today()
+	for employee in frappe.get_all("Employee", filters={"status": "Active"}, pluck="name"):
+		get_cached_report(employee, today.year, today.month)
+
+
+@frappe.whitelist()
+@instrument("job.generate_csv_weekly_pending_report")
+def generate_csv_weekly_pending_report(compress=None):
+	start_of_week, end_of_week = get_current_week()
 
+	# read on the replica, write the File on the primary
+	with replica():
+		employees = frappe.get_all("Employee", filters={"status": "Active"}, fields=["name", "employee_name"])
+		rows = list(iter_weekly_pending_rows(employees, start_of_week, end_of_week))
+	return publish_weekly_pending_report(rows, len(employees), start_of_week, end_of_week, compress)
+
+
+def get_current_week():
+	today = date.today()
 	start_of_week = today - timedelta(days=today.weekday())
-	end_of_week = start_of_week + timedelta(days=4)
+	return start_of_week, start_of_week + timedelta(days=4)
 
-	holiday_lists = frappe.get_all(
-		"Holiday", filters={"holiday_date": ["between", [start_of_week, end_of_week]]}, pluck="holiday_date"
+
+@read_only
+def collect_weekly_pending_rows(employees, start_of_week, end_of_week):
+	"""Shard step of the sharded weekly report: pending rows for the shard's employees."""
+	shard_employees = frappe.get_all(
+		"Employee", filters={"name": ["in", employees]}, fields=["name", "employee_name"]
 	)
+	return list(iter_weekly_pending_rows(shard_employees, start_of_week, end_of_week))
 
-	employees = frappe.get_all("Employee", filters={"status": "Active"}, fields=["name", "employee_name"])
 
-	data = []
+def merge_weekly_pending_rows(results, run, start_of_week, end_of_week):
+	"""Aggregation step of the sharded weekly report: one CSV, ordered by employee."""
+	rows = sorted((row for rows in results if rows for row in rows), key=lambda row: row[0])
+	employee_count = frappe.db.count("Employee", {"status": "Active"})
+	return publish_weekly_pending_report(rows, employee_count, start_of_week, end_of_week)
 
-	for emp in employees:
-		timesheets = frappe.get_all(
-			"Timesheet",
-			filters={
-				"employee": emp.name,
-				"start_date": ["between", [start_of_week, end_of_week]],
-				"docstatus": 1,
-			},
-			fields=["start_date"],
-		)
-		filled_dates = {t.start_date for t in timesheets} if timesheets else set()
-
-		missing_days = []
-		current = start_of_week
-		while current <= end_of_week:
-			if current.weekday() < 5 and current not in holiday_lists and current not in filled_dates:
-				missing_days.append(current)
-			current += timedelta(days=1)
 
-		if missing_days:
-			pending_dates = ", ".join([d.strftime("%Y-%m-%d") for d in missing_days])
-			data.append([emp.name, emp.employee_name, pending_dates])
+def publish_weekly_pending_report(rows, employee_count, start_of_week, end_of_week, compress=None):
+	if compress is None:
+		compress = employee_count >= (frappe.conf.get("pending_report_gzip_threshold") or 5000)
 
-	if not data:
+	file_doc = save_private_csv(
+		f"Pending_Timesheets_{start_of_week.strftime('%W_%Y')}.csv",
+		["Employee ID", "Employee Name", "Pending Dates"],
+		rows,
+		compress=cint(compress),
+	)
+	if not file_doc:
 		frappe.msgprint(_("All employees have submitted timesheets for this week!"))
 		return
 
-	output = io.StringIO()
-	writer = csv.writer(output)
-	writer.writerow(["Employee ID", "Employee Name", "Pending Dates"])
-	writer.writerows(data)
-	csv_data = output.getvalue()
-	output.close()
+	send_document_to_chat(file_doc, f"Pending Timesheets ({start_of_week} → {end_of_week})")
+	return {
+		"file_url": file_doc.file_url,
+		"message": "Pending Timesheets CSV generated and sent to Telegram",
+	}
+
+
+def save_private_csv(file_name, header, rows, compress=False):
+	"""Stream `rows` into a private File. Returns None, and leaves nothing behind, when there are no rows."""
+	file_path = get_private_file_path(file_name + (".gz" if compress else ""))
+	stream = HashingWriter(file_path)
+	if not write_csv(stream, header, rows, compress=compress):
+		os.remove(file_path)
+		return
+
+	return insert_private_file(file_path, stream)
+
+
+class HashingWriter(io.RawIOBase):
+	"""Binary file that keeps the md5 and size of what is written, so its File row needs no second read."""
+
+	def __init__(self, file_path):
+		self.file = open(file_path, "wb")
+		self.md5 = hashlib.md5()
+		self.size = 0
+
+	def writable(self):
+		return True
 
+	def write(self, data):
+		self.md5.update(data)
+		self.size += len(data)
+		return self.file.write(data)
+
+	def tell(self):
+		return self.size
+
+	def close(self):
+		if not self.closed:
+			self.file.close()
+		super().close()
+
+
+def insert_private_file(file_path, stream):
+	"""Insert the File row directly, with the hash and size the HashingWriter collected."""
+	file_name = os.path.basename(file_path)
 	file_doc = frappe.get_doc(
 		{
 			"doctype": "File",
-			"file_name": f"Pending_Timesheets_{start_of_week.strftime('%W_%Y')}.csv",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
 			"is_private": 1,
-			"content": csv_data,
+			"folder": "Home",
+			"file_type": file_name.rsplit(".", 1)[-1].upper(),
+			"file_size": stream.size,
+			"content_hash": stream.md5.hexdigest(),
 		}
 	)
-	file_doc.save(ignore_permissions=True)
+	file_doc.set_new_name()
+	file_doc.set_user_and_timestamp()
+	file_doc.db_insert()
+	return file_doc
+
 
+def send_document_to_chat(file_doc, caption):
 	token = frappe.conf.get("telegram_bot_token")
 	chat_id = frappe.conf.get("telegram_chat_id")
 
 	if not token or not chat_id:
 		frappe.log_error("Missing Telegram bot token or chat_id", "Telegram Config Error")
 	else:
-		try:
-			url = f"https://api.telegram.org/bot{token}/sendDocument"
-			files = {"document": (file_doc.file_name, csv_data.encode("utf-8"), "text/csv")}
-			data = {"chat_id": chat_id, "caption": f"Pending Timesheets ({start_of_week} → {end_of_week})"}
-			response = requests.post(url, data=data, files=files)
-			response.raise_for_status()
-		except Exception as e:
-			frappe.log_error(f"Telegram send failed: {e}", "Telegram Error")
+		enqueue_document(chat_id, file_doc.name, caption=caption)
 
-	return {
-		"file_url": file_doc.file_url,
-		"message": "Pending Timesheets CSV generated and sent to Telegram",
-	}
+
+def iter_weekly_pending_rows(employees, start_of_week, end_of_week):
+	pending_dates = get_compliance(
+		start_of_week, end_of_week, [emp.name for emp in employees]
+	).pending_dates()
+
+	for emp in employees:
+		if missing_days := pending_dates.get(emp.name):
+			yield [emp.name, emp.employee_name, ", ".join([d.strftime("%Y-%m-%d") for d in missing_days])]
+
+
+def get_private_file_path(file_name):
+	file_path = frappe.get_site_path("private", "files", file_name)
+	if os.path.exists(file_path):
+		stem, ext = file_name.split(".", 1)
+		file_path = frappe.get_site_path("private", "files", f"{stem}_{frappe.generate_hash(length=6)}.{ext}")
+	return file_path
+
+
+def write_csv(stream, header, rows, compress=False):
+	"""Stream `rows` to a binary `stream` as they are produced, close it and return how many were written."""
+	count = 0
+	raw = gzip.GzipFile(fileobj=stream, mode="wb") if compress else stream
+	with io.TextIOWrapper(raw, newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		writer.writerow(header)
+		for row in rows:
+			writer.writerow(row)
+			count += 1
+	# GzipFile leaves a fileobj it was handed open
+	stream.close()
+	return count
 
 
 @frappe.whitelist()
 def send_weekly_timesheet_report():
-	frappe.log("Enqueuing weekly timesheet report generation task")
-	frappe.enqueue(
-		"timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report.generate_csv_weekly_pending_report",
-		queue="long",
+	if frappe.conf.get("weekly_pending_report_mode") == "delta":
+		frappe.enqueue(
+			"timesheet_management_system.api.pending_report_delta.send_pending_report_delta", queue="long"
+		)
+		return
+
+	start_of_week, end_of_week = get_current_week()
+	fan_out(
+		"weekly_pending_report",
+		"timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report.collect_weekly_pending_rows",
+		"timesheet_management_system.timesheet_management_system.report.employee_timesheet_report.employee_timesheet_report.merge_weekly_pending_rows",
+		start_of_week=start_of_week,
+		end_of_week=end_of_week,
 	)
@@ -0,0 +1,71 @@
+// Copyright (c) 2025, velmurugan Dharani and contributors
+// For license information, please see license.txt
+
+const STATUS_COLORS = {
+	Filled: "green",
+	Draft: "orange",
+	Leave: "blue",
+	Holiday: "gray",
+	Weekend: "gray",
+	Pending: "red",
+};
+
+frappe.query_reports["Team Timesheet Matrix"] = {
+	filters: [
+		{
+			fieldname: "company",
+			label: __("Company"),
+			fieldtype: "Link",
+			options: "Company",
+			reqd: 1,
+			default: frappe.defaults.get_user_default("Company"),
+		},
+		{
+			fieldname: "department",
+			label: __("Department"),
+			fieldtype: "Link",
+			options: "Department",
+		},
+		{
+			fieldname: "from_date",
+			label: __("From Date"),
+			fieldtype: "Date",
+			reqd: 1,
+			default: frappe.datetime.month_start(),
+		},
+		{
+			fieldname: "to_date",
+			label: __("To Date"),
+			fieldtype: "Date",
+			reqd: 1,
+			default: frappe.datetime.month_end(),
+		},
+		{
+			fieldname: "page",
+			label: __("Page"),
+			fieldtype: "Int",
+			default: 1,
+		},
+		{
+			fieldname: "page_length",
+			label: __("Employees per Page"),
+			fieldtype: "Select",
+			options: ["100", "250", "500", "1000"],
+			default: "100",
+		},
+	],
+
+	formatter(value, row, column, data, default_formatter) {
+		value = default_formatter(value, row, column, data);
+		const status = data && data[`${column.fieldname}_status`];
+		if (status) {
+			value = `<span class="indicator-pill ${STATUS_COLORS[status] || "gray"}" title="${__(
+				status
+			)}">${value}</span>`;
+		}
+		if (data && data.bold) {
+			value = `<b>${value}</b>`;
+		}
+		return value;
+	},
+};
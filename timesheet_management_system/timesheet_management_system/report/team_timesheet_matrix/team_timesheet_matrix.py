@@ -0,0 +1,159 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import cint, date_diff, getdate
+
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	get_ledger,
+)
+from timesheet_management_system.utils.replica import read_only
+from timesheet_management_system.utils.working_days import working_days_between
+
+MAX_DAYS = 62
+
+
+@read_only
+def execute(filters=None):
+	if not filters:
+		return [], []
+
+	# getdate(None) is today, so check the raw values before converting
+	if not (filters.get("company") and filters.get("from_date") and filters.get("to_date")):
+		frappe.throw(_("Please select Company, From Date and To Date"))
+	from_date, to_date = getdate(filters.get("from_date")), getdate(filters.get("to_date"))
+	if from_date > to_date:
+		frappe.throw(_("From Date cannot be after To Date"))
+	if date_diff(to_date, from_date) >= MAX_DAYS:
+		frappe.throw(_("Please select a range of at most {0} days").format(MAX_DAYS))
+
+	page = max(cint(filters.get("page")), 1)
+	page_length = cint(filters.get("page_length")) or 100
+
+	days = [from_date + timedelta(days=offset) for offset in range(date_diff(to_date, from_date) + 1)]
+	working_days = set(working_days_between(from_date, to_date))
+
+	employee_filters = get_employee_filters(filters)
+	total_employees = frappe.db.count("Employee", employee_filters)
+	employees = frappe.get_all(
+		"Employee",
+		filters=employee_filters,
+		fields=["name", "employee_name"],
+		order_by="name asc",
+		limit_start=(page - 1) * page_length,
+		limit_page_length=page_length,
+	)
+
+	ledger = {}
+	if employees:
+		for row in get_ledger(
+			from_date,
+			to_date,
+			employee=["in", [e.name for e in employees]],
+			fields=["employee", "date", "status", "hours"],
+		):
+			ledger[(row.employee, row.date)] = row
+
+	data = []
+	total_pending = 0
+	for emp in employees:
+		row = {"employee": emp.name, "employee_name": emp.employee_name, "total_hours": 0, "pending_days": 0}
+		for day in days:
+			entry = ledger.get((emp.name, day))
+			status = get_cell_status(day, entry, working_days)
+			row[day_fieldname(day)] = entry.hours if entry and entry.hours else 0
+			row[f"{day_fieldname(day)}_status"] = status
+			row["total_hours"] += row[day_fieldname(day)]
+			if status == "Pending":
+				row["pending_days"] += 1
+		total_pending += row["pending_days"]
+		data.append(row)
+
+	if employees:
+		data.append(get_totals_row(employee_filters, from_date, to_date, days))
+
+	summary = [
+		{"label": _("Employees"), "value": total_employees, "indicator": "Blue"},
+		{
+			"label": _("Page"),
+			"value": f"{page} / {max((total_employees + page_length - 1) // page_length, 1)}",
+			"indicator": "Blue",
+		},
+		{"label": _("Pending Days (this page)"), "value": total_pending, "indicator": "Red"},
+	]
+
+	return get_columns(days), data, None, None, summary
+
+
+def get_employee_filters(filters):
+	employee_filters = {"status": "Active", "company": filters.get("company")}
+	if filters.get("department"):
+		employee_filters["department"] = filters.get("department")
+	return employee_filters
+
+
+def get_cell_status(day, entry, working_days):
+	if entry and entry.status in ("Filled", "Draft", "Leave"):
+		return entry.status
+	if day.weekday() >= 5:
+		return "Weekend"
+	if day not in working_days:
+		return "Holiday"
+	return "Pending"
+
+
+def get_totals_row(employee_filters, from_date, to_date, days):
+	"""Hours per day over every employee in scope, not just the current page, in one grouped query."""
+	conditions = ["e.status = %(status)s", "e.company = %(company)s"]
+	if employee_filters.get("department"):
+		conditions.append("e.department = %(department)s")
+
+	hours_by_date = dict(
+		frappe.db.sql(
+			f"""
+			select l.date, sum(l.hours)
+			from `tabTimesheet Compliance Ledger` l
+			inner join `tabEmployee` e on e.name = l.employee
+			where l.date between %(from_date)s and %(to_date)s
+				and l.is_filled = 1
+				and {" and ".join(conditions)}
+			group by l.date
+			""",
+			{**employee_filters, "from_date": from_date, "to_date": to_date},
+		)
+	)
+
+	row = {"employee_name": _("Total (all pages)"), "bold": 1, "total_hours": 0}
+	for day in days:
+		row[day_fieldname(day)] = hours_by_date.get(day) or 0
+		row["total_hours"] += row[day_fieldname(day)]
+	return row
+
+
+def day_fieldname(day):
+	return f"day_{day.strftime('%Y_%m_%d')}"
+
+
+def get_columns(days):
+	columns = [
+		{
+			"label": _("Employee"),
+			"fieldname": "employee",
+			"fieldtype": "Link",
+			"options": "Employee",
+			"width": 120,
+		},
+		{"label": _("Employee Name"), "fieldname": "employee_name", "fieldtype": "Data", "width": 160},
+	]
+	columns += [
+		{"label": day.strftime("%d %a"), "fieldname": day_fieldname(day), "fieldtype": "Float", "width": 70}
+		for day in days
+	]
+	columns += [
+		{"label": _("Total Hours"), "fieldname": "total_hours", "fieldtype": "Float", "width": 100},
+		{"label": _("Pending Days"), "fieldname": "pending_days", "fieldtype": "Int", "width": 100},
+	]
+	return columns
@@ -0,0 +1,36 @@
+// Copyright (c) 2025, velmurugan Dharani and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Yearly Timesheet Summary"] = {
+	filters: [
+		{
+			fieldname: "year",
+			label: __("Year"),
+			fieldtype: "Int",
+			reqd: 1,
+			default: new Date().getFullYear(),
+		},
+		{
+			fieldname: "company",
+			label: __("Company"),
+			fieldtype: "Link",
+			options: "Company",
+			reqd: 1,
+			default: frappe.defaults.get_user_default("Company"),
+		},
+		{
+			fieldname: "department",
+			label: __("Department"),
+			fieldtype: "Link",
+			options: "Department",
+		},
+	],
+
+	formatter(value, row, column, data, default_formatter) {
+		value = default_formatter(value, row, column, data);
+		if (column.fieldname === "change" && data && data.change) {
+			value = `<span style="color: ${data.change < 0 ? "red" : "green"}">${value}</span>`;
+		}
+		return value;
+	},
+};
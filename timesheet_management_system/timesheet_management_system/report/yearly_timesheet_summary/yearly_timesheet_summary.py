@@ -0,0 +1,110 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+import calendar
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_monthly_rollup.timesheet_monthly_rollup import (
+	ROLLUP,
+)
+from timesheet_management_system.utils.replica import read_only
+
+
+@read_only
+def execute(filters=None):
+	if not filters:
+		return [], []
+
+	year = cint(filters.get("year"))
+	if not (year and filters.get("company")):
+		frappe.throw(_("Please select Year and Company"))
+
+	conditions = ["e.company = %(company)s"]
+	if filters.get("department"):
+		conditions.append("e.department = %(department)s")
+
+	# twelve rollup rows per employee instead of a year of ledger rows
+	rollups = frappe.db.sql(
+		f"""
+		select r.employee, e.employee_name, r.year, r.month, r.total_hours, r.filled_days, r.pending_days
+		from `tab{ROLLUP}` r
+		inner join `tabEmployee` e on e.name = r.employee
+		where r.year in %(years)s and {" and ".join(conditions)}
+		order by r.employee
+		""",
+		{**filters, "years": [year, year - 1]},
+		as_dict=True,
+	)
+
+	rows = {}
+	previous_totals = {}
+	for r in rollups:
+		if r.year != year:
+			previous_totals[r.employee] = previous_totals.get(r.employee, 0) + (r.total_hours or 0)
+			continue
+
+		row = rows.setdefault(
+			r.employee,
+			{
+				"employee": r.employee,
+				"employee_name": r.employee_name,
+				"total_hours": 0,
+				"filled_days": 0,
+				"pending_days": 0,
+			},
+		)
+		row[month_fieldname(r.month)] = r.total_hours or 0
+		row["total_hours"] += r.total_hours or 0
+		row["filled_days"] += r.filled_days or 0
+		row["pending_days"] += r.pending_days or 0
+
+	data = []
+	for employee, row in rows.items():
+		previous = previous_totals.get(employee, 0)
+		row["previous_total_hours"] = previous
+		row["change"] = row["total_hours"] - previous
+		data.append(row)
+
+	return get_columns(year), data
+
+
+def month_fieldname(month):
+	return calendar.month_abbr[month].lower()
+
+
+def get_columns(year):
+	columns = [
+		{
+			"label": _("Employee"),
+			"fieldname": "employee",
+			"fieldtype": "Link",
+			"options": "Employee",
+			"width": 120,
+		},
+		{"label": _("Employee Name"), "fieldname": "employee_name", "fieldtype": "Data", "width": 160},
+	]
+	columns += [
+		{
+			"label": _(calendar.month_abbr[month]),
+			"fieldname": month_fieldname(month),
+			"fieldtype": "Float",
+			"width": 70,
+		}
+		for month in range(1, 13)
+	]
+	columns += [
+		{"label": _("Total Hours"), "fieldname": "total_hours", "fieldtype": "Float", "width": 100},
+		{"label": _("Filled Days"), "fieldname": "filled_days", "fieldtype": "Int", "width": 90},
+		{"label": _("Pending Days"), "fieldname": "pending_days", "fieldtype": "Int", "width": 100},
+		{
+			"label": _("{0} Total").format(year - 1),
+			"fieldname": "previous_total_hours",
+			"fieldtype": "Float",
+			"width": 100,
+		},
+		{"label": _("Change"), "fieldname": "change", "fieldtype": "Float", "width": 90},
+	]
+	return columns
@@ -0,0 +1,10 @@
+import frappe
+
+
+def clear_now_and_after_commit(clear):
+	"""
+	Run `clear` now and again once the transaction commits: a reader in between still sees the old rows
+	and may cache them under the new state, so the second run drops that entry.
+	"""
+	clear()
+	frappe.db.after_commit.add(clear)
@@ -0,0 +1,119 @@
+import frappe
+import numpy as np
+from frappe.utils import getdate
+
+from timesheet_management_system.timesheet_management_system.doctype.timesheet_compliance_ledger.timesheet_compliance_ledger import (
+	LEDGER,
+)
+from timesheet_management_system.utils.working_days import get_year_bitmap, iter_year_ranges
+
+# Above this many employees one range scan of the ledger beats a long `in` list
+IN_FILTER_LIMIT = 1000
+
+
+class ComplianceMatrix:
+	"""Employee-by-day view of the ledger as NumPy arrays."""
+
+	def __init__(self, from_date, to_date, employees):
+		self.from_date, self.to_date = getdate(from_date), getdate(to_date)
+		self.employees = list(employees)
+		self.index = {name: i for i, name in enumerate(self.employees)}
+		self.days = np.arange(
+			np.datetime64(self.from_date), np.datetime64(self.to_date) + np.timedelta64(1, "D")
+		)
+
+		shape = (len(self.employees), len(self.days))
+		self.filled = np.zeros(shape, dtype=bool)
+		self.draft = np.zeros(shape, dtype=bool)
+		self.on_leave = np.zeros(shape, dtype=bool)
+		self.hours = np.zeros(shape, dtype=float)
+		self.weekday = np.is_busday(self.days)
+		self.working = self.weekday.copy()
+
+	@property
+	def holiday(self):
+		"""Weekdays the holiday calendar takes off."""
+		return self.weekday & ~self.working
+
+	def pending_mask(self, excuse_leave=False):
+		mask = self.working & ~self.filled
+		if excuse_leave:
+			mask &= ~self.on_leave
+		return mask
+
+	def pending_counts(self, excuse_leave=False):
+		"""{employee: pending working days} for every employee in the matrix."""
+		counts = np.count_nonzero(self.pending_mask(excuse_leave), axis=1)
+		return dict(zip(self.employees, counts.tolist(), strict=True))
+
+	def pending_dates(self, excuse_leave=False):
+		"""{employee: [pending dates]}, only for employees with at least one pending day."""
+		rows, cols = np.nonzero(self.pending_mask(excuse_leave))
+		if not len(rows):
+			return {}
+
+		dates = self.days[cols].tolist()
+		# np.nonzero is row-major, so each employee's days form one contiguous run
+		starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+		ends = np.r_[starts[1:], len(rows)]
+		return {
+			self.employees[rows[s]]: dates[s:e] for s, e in zip(starts.tolist(), ends.tolist(), strict=True)
+		}
+
+	def pending_bitmasks(self, excuse_leave=False):
+		"""{employee: int} with bit n set when day n of the range is pending, only for employees with one."""
+		mask = self.pending_mask(excuse_leave)
+		packed = np.packbits(mask, axis=1, bitorder="little")
+		return {
+			self.employees[i]: int.from_bytes(packed[i].tobytes(), "little")
+			for i in np.flatnonzero(mask.any(axis=1)).tolist()
+		}
+
+	def total_hours(self):
+		return dict(zip(self.employees, (self.hours * self.filled).sum(axis=1).tolist(), strict=True))
+
+
+def get_compliance(from_date, to_date, employees=None, holiday_list=None):
+	"""Build the compliance matrix for `employees` (default: every active employee) over a date range."""
+	if employees is None:
+		employees = frappe.get_all("Employee", filters={"status": "Active"}, pluck="name", order_by="name")
+
+	matrix = ComplianceMatrix(from_date, to_date, employees)
+	matrix.working = working_day_mask(matrix.from_date, matrix.to_date, holiday_list)
+	if not matrix.employees:
+		return matrix
+
+	filters = {"date": ["between", [matrix.from_date, matrix.to_date]]}
+	if len(matrix.employees) <= IN_FILTER_LIMIT:
+		filters["employee"] = ["in", matrix.employees]
+	rows = frappe.get_all(
+		LEDGER,
+		filters=filters,
+		fields=["employee", "date", "hours", "is_filled", "is_draft", "on_leave"],
+		as_list=True,
+	)
+	if not rows:
+		return matrix
+
+	employee, day, hours, is_filled, is_draft, on_leave = zip(*rows, strict=True)
+	emp_idx = np.fromiter((matrix.index.get(e, -1) for e in employee), dtype=np.int64, count=len(rows))
+	day_idx = (np.array(day, dtype="datetime64[D]") - matrix.days[0]).astype(np.int64)
+	known = emp_idx >= 0
+	emp_idx, day_idx = emp_idx[known], day_idx[known]
+
+	matrix.filled[emp_idx, day_idx] = np.array(is_filled, dtype=bool)[known]
+	matrix.draft[emp_idx, day_idx] = np.array(is_draft, dtype=bool)[known]
+	matrix.on_leave[emp_idx, day_idx] = np.array(on_leave, dtype=bool)[known]
+	matrix.hours[emp_idx, day_idx] = np.array([h or 0 for h in hours], dtype=float)[known]
+	return matrix
+
+
+def working_day_mask(from_date, to_date, holiday_list=None):
+	"""Unpack the cached working-day bitsets of utils.working_days into a boolean array over the range."""
+	parts = []
+	for year, first, last in iter_year_ranges(from_date, to_date):
+		length = last - first + 1
+		bits = (get_year_bitmap(year, holiday_list) >> first) & ((1 << length) - 1)
+		packed = np.frombuffer(bits.to_bytes((length + 7) // 8, "little"), dtype=np.uint8)
+		parts.append(np.unpackbits(packed, bitorder="little")[:length].astype(bool))
+	return np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
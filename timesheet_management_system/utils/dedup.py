@@ -0,0 +1,41 @@
+import frappe
+
+SEEN_UPDATES_KEY = "telegram_updates_seen"
+# Telegram keeps undelivered updates for 24 hours, so nothing older can be redelivered
+SEEN_UPDATES_TTL = 24 * 60 * 60
+SEEN_UPDATES_LIMIT = 10000
+
+ACCEPTED, DUPLICATE, STALE = 0, 1, 2
+
+# Keeps the newest SEEN_UPDATES_LIMIT update ids in a sorted set. An id older than everything kept
+# is stale: it was trimmed or it arrived badly out of order, so it is dropped without a lookup.
+CLAIM_SCRIPT = """
+local update_id = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+
+if redis.call("ZCARD", KEYS[1]) >= limit then
+	local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+	if oldest[2] and update_id < tonumber(oldest[2]) then
+		return 2
+	end
+end
+
+if redis.call("ZADD", KEYS[1], "NX", update_id, update_id) == 0 then
+	return 1
+end
+
+redis.call("ZREMRANGEBYRANK", KEYS[1], 0, -limit - 1)
+redis.call("EXPIRE", KEYS[1], tonumber(ARGV[3]))
+return 0
+"""
+
+
+def claim_update(update_id):
+	"""Atomically record `update_id`; returns ACCEPTED the first time, DUPLICATE or STALE afterwards."""
+	script = frappe.cache.register_script(CLAIM_SCRIPT)
+	return int(
+		script(
+			keys=[frappe.cache.make_key(SEEN_UPDATES_KEY)],
+			args=[update_id, SEEN_UPDATES_LIMIT, SEEN_UPDATES_TTL],
+		)
+	)
@@ -0,0 +1,134 @@
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+import frappe
+
+from timesheet_management_system.api.command_cache import get_versions
+from timesheet_management_system.utils.replica import primary
+
+# bump the suffix when EmployeeIndex changes shape, so pickled indexes of the old shape are not loaded
+CACHE_KEY = "employee_lookup_index|2"
+CACHE_TTL = 24 * 60 * 60
+MIN_SIMILARITY = 0.4
+
+# per worker process: {site: (version, index)}
+_indexes = {}
+
+
+def normalize_id(value):
+	return re.sub(r"[^0-9A-Z]", "", (value or "").upper())
+
+
+def normalize_name(value):
+	return " ".join((value or "").casefold().split())
+
+
+def trigrams(text):
+	"""Trigrams of each word, padded so word starts weigh more than their middles."""
+	return {
+		padded[i : i + 3]
+		for word in text.split()
+		for padded in [f"  {word} "]
+		for i in range(len(padded) - 2)
+	}
+
+
+class EmployeeIndex:
+	"""Active employees keyed by exact and normalized ID, name prefix and name trigrams."""
+
+	def __init__(self, employees):
+		self.employees = [(e.name, e.employee_name or e.name) for e in employees]
+		self.by_name = {name.upper(): i for i, (name, _) in enumerate(self.employees)}
+		# "EMP-1-10" and "EMP-11-0" both normalize to "EMP110": keep only normalized IDs that are unique
+		by_id = defaultdict(list)
+		for i, (name, _) in enumerate(self.employees):
+			by_id[normalize_id(name)].append(i)
+		self.by_id = {key: ids[0] for key, ids in by_id.items() if len(ids) == 1}
+		self.words = sorted(
+			(word, i)
+			for i, (_, employee_name) in enumerate(self.employees)
+			for word in set(normalize_name(employee_name).split())
+		)
+		self.name_trigrams = []
+		self.postings = {}
+		for i, (_, employee_name) in enumerate(self.employees):
+			grams = trigrams(normalize_name(employee_name))
+			self.name_trigrams.append(len(grams))
+			for gram in grams:
+				self.postings.setdefault(gram, []).append(i)
+
+	def get(self, employee_id):
+		"""The employee with this ID, ignoring case, or separators too when that is unambiguous."""
+		i = self.id_match(employee_id)
+		return None if i is None else self.row(i)
+
+	def id_match(self, employee_id):
+		i = self.by_name.get((employee_id or "").strip().upper())
+		return self.by_id.get(normalize_id(employee_id)) if i is None else i
+
+	def find(self, query, limit=10):
+		"""ID match first, then names whose words start with every query word, then trigram look-alikes."""
+		matches = []
+		if (i := self.id_match(query)) is not None:
+			matches.append(i)
+
+		query = normalize_name(query)
+		for i in self.prefix_matches(query):
+			if i not in matches:
+				matches.append(i)
+
+		if len(matches) < limit:
+			for i in self.similar(query):
+				if i not in matches:
+					matches.append(i)
+
+		return [self.row(i) for i in matches[:limit]]
+
+	def prefix_matches(self, query):
+		candidates = None
+		for token in query.split():
+			start = bisect_left(self.words, (token, -1))
+			found = set()
+			for word, i in self.words[start:]:
+				if not word.startswith(token):
+					break
+				found.add(i)
+			candidates = found if candidates is None else candidates & found
+			if not candidates:
+				return []
+		return sorted(candidates or [], key=lambda i: self.employees[i][1])
+
+	def similar(self, query):
+		grams = trigrams(query)
+		shared = Counter(i for gram in grams for i in self.postings.get(gram, ()))
+		# share of the query found in the name, so a partial name still scores high; ties go to shorter names
+		scored = sorted(
+			((count / len(grams), -self.name_trigrams[i], i) for i, count in shared.items()), reverse=True
+		)
+		return [i for score, _, i in scored if score >= MIN_SIMILARITY]
+
+	def row(self, i):
+		name, employee_name = self.employees[i]
+		return frappe._dict(name=name, employee_name=employee_name)
+
+
+def get_employee_index():
+	"""The index for the current `employees` cache version, shared between workers through Redis."""
+	version = get_versions(["employees"])
+	cached = _indexes.get(frappe.local.site)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	key = f"{CACHE_KEY}|{version}"
+	index = frappe.cache.get_value(key)
+	if index is None:
+		with primary():
+			employees = frappe.get_all(
+				"Employee", filters={"status": "Active"}, fields=["name", "employee_name"]
+			)
+		index = EmployeeIndex(employees)
+		frappe.cache.set_value(key, index, expires_in_sec=CACHE_TTL)
+
+	_indexes[frappe.local.site] = (version, index)
+	return index
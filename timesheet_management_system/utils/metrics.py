@@ -0,0 +1,154 @@
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import frappe
+
+METRICS_KEY = "timesheet_metrics"
+PROFILE_KEY = "timesheet_profile"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+@contextmanager
+def count_queries():
+	"""Count every statement issued through frappe.db.sql while the block runs."""
+	counter = frappe._dict(count=0)
+	db = getattr(frappe.local, "db", None)
+	if not db:
+		# threads that only talk to Redis and HTTP, e.g. the direct reminder senders
+		yield counter
+		return
+
+	original_sql = db.sql
+
+	def sql(*args, **kwargs):
+		counter.count += 1
+		return original_sql(*args, **kwargs)
+
+	db.sql = sql
+	try:
+		yield counter
+	finally:
+		db.sql = original_sql
+
+
+@contextmanager
+def track(name):
+	"""Record latency, query count and errors of the block under `name`."""
+	profiler = start_profile(name)
+	failed = False
+	started = time.perf_counter()
+	try:
+		with count_queries() as queries:
+			yield
+	except Exception:
+		failed = True
+		raise
+	finally:
+		elapsed = time.perf_counter() - started
+		if profiler:
+			save_profile(name, profiler)
+		record(name, elapsed, queries.count, failed)
+
+
+def instrument(name):
+	def decorator(fn):
+		@wraps(fn)
+		def wrapper(*args, **kwargs):
+			with track(name):
+				return fn(*args, **kwargs)
+
+		return wrapper
+
+	return decorator
+
+
+def record(name, elapsed, queries, failed=False):
+	bucket = next((le for le in BUCKETS if elapsed <= le), "+Inf")
+	key = frappe.cache.make_key(METRICS_KEY)
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.hincrby(key, f"{name}|bucket|{bucket}", 1)
+	pipeline.hincrby(key, f"{name}|count", 1)
+	pipeline.hincrbyfloat(key, f"{name}|sum", elapsed)
+	pipeline.hincrby(key, f"{name}|queries", queries)
+	if failed:
+		pipeline.hincrby(key, f"{name}|errors", 1)
+	pipeline.execute()
+
+
+def increment(name, value=1):
+	"""Plain event counter, exported as timesheet_events_total."""
+	frappe.cache.hincrby(frappe.cache.make_key(METRICS_KEY), f"{name}|events", value)
+
+
+def get_metrics():
+	"""{name: {"buckets": {le: n}, "count": n, "sum": s, "queries": n, "errors": n, "events": n}}"""
+	# counters are raw redis integers, not pickled values, so read them past RedisWrapper.hgetall
+	pipeline = frappe.cache.pipeline()
+	pipeline.hgetall(frappe.cache.make_key(METRICS_KEY))
+	(raw,) = pipeline.execute()
+
+	metrics = {}
+	for field, value in raw.items():
+		name, _, stat = frappe.safe_decode(field).partition("|")
+		metric = metrics.setdefault(
+			name, frappe._dict(buckets={}, count=0, sum=0.0, queries=0, errors=0, events=0)
+		)
+		if stat.startswith("bucket|"):
+			metric.buckets[stat.split("|", 1)[1]] = int(value)
+		elif stat == "sum":
+			metric.sum = float(value)
+		else:
+			metric[stat] = int(value)
+	return metrics
+
+
+def to_prometheus(metrics):
+	lines = [
+		"# HELP timesheet_latency_seconds Latency of bot commands, scheduled jobs and Telegram calls.",
+		"# TYPE timesheet_latency_seconds histogram",
+	]
+	timed = {name: metric for name, metric in metrics.items() if metric.count}
+	counted = {name: metric for name, metric in metrics.items() if metric.events}
+
+	for name, metric in sorted(timed.items()):
+		cumulative = 0
+		for le in (*BUCKETS, "+Inf"):
+			cumulative += metric.buckets.get(str(le), 0)
+			lines.append(f'timesheet_latency_seconds_bucket{{name="{name}",le="{le}"}} {cumulative}')
+		lines.append(f'timesheet_latency_seconds_sum{{name="{name}"}} {metric.sum}')
+		lines.append(f'timesheet_latency_seconds_count{{name="{name}"}} {metric.count}')
+
+	for metric_name, stat, help_text in (
+		("timesheet_db_queries_total", "queries", "Database queries issued."),
+		("timesheet_errors_total", "errors", "Executions that raised."),
+	):
+		lines.append(f"# HELP {metric_name} {help_text}")
+		lines.append(f"# TYPE {metric_name} counter")
+		lines.extend(f'{metric_name}{{name="{name}"}} {m[stat]}' for name, m in sorted(timed.items()))
+
+	lines.append("# HELP timesheet_events_total Occurrences of counted events.")
+	lines.append("# TYPE timesheet_events_total counter")
+	lines.extend(f'timesheet_events_total{{name="{name}"}} {m.events}' for name, m in sorted(counted.items()))
+
+	return "\n".join(lines) + "\n"
+
+
+def start_profile(name):
+	if not frappe.cache.hget(PROFILE_KEY, f"{name}|requested"):
+		return
+	frappe.cache.hdel(PROFILE_KEY, f"{name}|requested")
+	profiler = cProfile.Profile()
+	profiler.enable()
+	return profiler
+
+
+def save_profile(name, profiler):
+	profiler.disable()
+	output = io.StringIO()
+	pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(50)
+	frappe.cache.hset(PROFILE_KEY, name, output.getvalue())
@@ -0,0 +1,57 @@
+import time
+
+import frappe
+
+# Refill and take in one round trip so concurrent workers never overdraw a bucket.
+# Returns the number of seconds the caller has to wait before the tokens are available.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+	tokens = tokens - requested
+else
+	wait = (requested - tokens) / rate
+end
+
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+	"""Redis-backed token bucket shared by every worker on the site."""
+
+	def __init__(self, key, rate, capacity=None):
+		self.key = key
+		self.rate = float(rate)
+		self.capacity = float(capacity or max(rate, 1))
+
+	def try_acquire(self, tokens=1):
+		"""Take `tokens` if available and return 0, otherwise return the seconds to wait."""
+		script = frappe.cache.register_script(TOKEN_BUCKET_SCRIPT)
+		wait = script(
+			keys=[frappe.cache.make_key(f"token_bucket|{self.key}")],
+			args=[self.rate, self.capacity, time.time(), tokens],
+		)
+		return float(wait)
+
+	def acquire(self, tokens=1, timeout=None):
+		"""Block until `tokens` are taken from the bucket. Returns False if `timeout` runs out first."""
+		deadline = None if timeout is None else time.monotonic() + timeout
+		while True:
+			wait = self.try_acquire(tokens)
+			if not wait:
+				return True
+			if deadline is not None and time.monotonic() + wait > deadline:
+				return False
+			time.sleep(wait)
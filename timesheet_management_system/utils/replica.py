@@ -0,0 +1,148 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import frappe
+from frappe.utils import cint
+
+from timesheet_management_system.utils.metrics import increment
+
+HEALTH_KEY = "timesheet_replica_health"
+# how long one health verdict is trusted, so a down replica costs one failed connect per interval
+HEALTH_TTL = 15
+DEFAULT_MAX_LAG = 30
+
+# one replica connection per thread and site, reused by every replica block the worker runs
+_connections = threading.local()
+
+
+@contextmanager
+def replica():
+	"""Run the block's reads on the replica when enabled, reachable and not lagging. Never write inside."""
+	if getattr(frappe.local, "replica_primary_db", None):
+		# nested block, already routed
+		yield True
+		return
+	if not (frappe.conf.get("read_from_replica") and frappe.conf.get("replica_host")):
+		yield False
+		return
+
+	healthy = frappe.cache.get_value(HEALTH_KEY)
+	if healthy == 0:
+		increment("db.replica.fallback.cached")
+		yield False
+		return
+
+	try:
+		replica_db, checked_at = get_replica_connection()
+		# a connection idle past the health interval is checked again, which also catches dropped ones
+		routed = (healthy == 1 and time.monotonic() - checked_at < HEALTH_TTL) or lag_within_limit(replica_db)
+	except Exception:
+		increment("db.replica.fallback.unavailable")
+		frappe.cache.set_value(HEALTH_KEY, 0, expires_in_sec=HEALTH_TTL)
+		drop_replica_connection()
+		routed = False
+
+	if not routed:
+		yield False
+		return
+
+	remember_replica_connection(replica_db)
+	frappe.local.replica_primary_db = frappe.local.db
+	frappe.local.db = replica_db
+	increment("db.replica.used")
+	try:
+		yield True
+	finally:
+		use_primary()
+
+
+@contextmanager
+def primary():
+	"""Inside a `replica()` block, run this block on the primary, e.g. reads whose result gets cached."""
+	replica_db = frappe.local.db if getattr(frappe.local, "replica_primary_db", None) else None
+	if not replica_db:
+		yield
+		return
+
+	frappe.local.db = frappe.local.replica_primary_db
+	frappe.local.replica_primary_db = None
+	try:
+		yield
+	finally:
+		frappe.local.replica_primary_db = frappe.local.db
+		frappe.local.db = replica_db
+
+
+def read_only(fn):
+	"""Decorator form of `replica()`."""
+
+	@wraps(fn)
+	def wrapper(*args, **kwargs):
+		with replica():
+			return fn(*args, **kwargs)
+
+	return wrapper
+
+
+def get_replica_connection():
+	"""This thread's open replica connection and when it was last known good, connecting if there is none."""
+	site_connection = getattr(_connections, frappe.local.site, None)
+	if site_connection:
+		replica_db, checked_at = site_connection
+		# per-request state of the Database object must not leak into the next job
+		replica_db.value_cache = {}
+		return replica_db, checked_at
+
+	from frappe.database import get_db
+
+	conf = frappe.conf
+	user, password = conf.get("db_user") or conf.db_name, conf.db_password
+	if conf.get("different_credentials_for_replica"):
+		user, password = conf.replica_db_name, conf.replica_db_password
+
+	replica_db = get_db(
+		host=conf.replica_host, port=conf.get("replica_db_port"), user=user, password=password
+	)
+	replica_db.connect()
+	setattr(_connections, frappe.local.site, (replica_db, 0))
+	return replica_db, 0
+
+
+def remember_replica_connection(replica_db):
+	setattr(_connections, frappe.local.site, (replica_db, time.monotonic()))
+
+
+def drop_replica_connection():
+	site_connection = getattr(_connections, frappe.local.site, None)
+	if not site_connection:
+		return
+
+	delattr(_connections, frappe.local.site)
+	try:
+		site_connection[0].close()
+	except Exception:
+		pass
+
+
+def use_primary():
+	if not getattr(frappe.local, "replica_primary_db", None):
+		return
+
+	frappe.local.db = frappe.local.replica_primary_db
+	frappe.local.replica_primary_db = None
+
+
+def lag_within_limit(replica_db):
+	"""Whether replication is running and at most `replica_max_lag` seconds behind."""
+	max_lag = cint(frappe.conf.get("replica_max_lag")) or DEFAULT_MAX_LAG
+	status = replica_db.sql("show slave status", as_dict=True)
+	# no row: not set up as a replica, so nothing to lag behind; a NULL lag: replication is stopped
+	lag = status[0].Seconds_Behind_Master if status else 0
+	healthy = lag is not None and lag <= max_lag
+
+	if not healthy:
+		increment("db.replica.fallback.lag")
+	frappe.cache.set_value(HEALTH_KEY, int(healthy), expires_in_sec=HEALTH_TTL)
+	return healthy
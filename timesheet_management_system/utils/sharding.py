@@ -0,0 +1,131 @@
+import time
+import zlib
+
+import frappe
+from frappe.utils import cint
+
+from timesheet_management_system.utils.metrics import record, track
+
+RESULT_KEY = "timesheet_shard_result"
+DONE_KEY = "timesheet_shard_done"
+TIMINGS_KEY = "timesheet_shard_timings"
+DEFAULT_SHARDS = 4
+RESULT_TTL = 24 * 60 * 60
+
+
+def fan_out(job, method, aggregate, **kwargs):
+	"""Run `method` per shard of active employees as long jobs, then `aggregate` over their results."""
+	employees = frappe.get_all(
+		"Employee", filters={"status": "Active"}, fields=["name", "company", "department"], order_by="name"
+	)
+	shards = partition(
+		employees,
+		cint(frappe.conf.get("timesheet_job_shards")) or DEFAULT_SHARDS,
+		frappe.conf.get("timesheet_shard_by") or "hash",
+	)
+	run = frappe._dict(
+		job=job, run_id=frappe.generate_hash(length=10), started=time.time(), shards=len(shards)
+	)
+
+	if not shards:
+		enqueue_aggregate(run, aggregate, kwargs)
+
+	for shard, names in enumerate(shards):
+		frappe.enqueue(
+			"timesheet_management_system.utils.sharding.run_shard",
+			queue="long",
+			run=run,
+			shard=shard,
+			method=method,
+			aggregate=aggregate,
+			employees=names,
+			kwargs=kwargs,
+		)
+	return run.run_id
+
+
+def partition(employees, count, by="hash"):
+	"""Employee names in `count` shards. Company/department groups stay whole and are packed largest first."""
+	shards = [[] for _ in range(max(count, 1))]
+	if by == "hash":
+		for employee in employees:
+			shards[zlib.crc32(employee.name.encode()) % len(shards)].append(employee.name)
+	else:
+		groups = {}
+		for employee in employees:
+			groups.setdefault(employee.get(by) or "", []).append(employee.name)
+		for group in sorted(groups.values(), key=len, reverse=True):
+			min(shards, key=len).extend(group)
+	return [shard for shard in shards if shard]
+
+
+def run_shard(run, shard, method, aggregate, employees, kwargs):
+	started = time.perf_counter()
+	try:
+		with track(f"job.{run.job}.shard"):
+			result = frappe.get_attr(method)(employees=employees, **kwargs)
+	except Exception:
+		frappe.log_error(title=f"{run.job}: shard {shard + 1}/{run.shards} failed")
+		result = None
+
+	frappe.cache.set_value(
+		f"{RESULT_KEY}|{run.run_id}|{shard}",
+		{"result": result, "elapsed": time.perf_counter() - started, "employees": len(employees)},
+		expires_in_sec=RESULT_TTL,
+	)
+
+	# the result is stored before the shard counts as done, so whoever sees the last count sees every result
+	done_key = frappe.cache.make_key(f"{DONE_KEY}|{run.run_id}")
+	pipeline = frappe.cache.pipeline()
+	pipeline.incr(done_key)
+	pipeline.expire(done_key, RESULT_TTL)
+	done, _ = pipeline.execute()
+
+	if done == run.shards:
+		enqueue_aggregate(run, aggregate, kwargs)
+
+
+def enqueue_aggregate(run, aggregate, kwargs):
+	frappe.enqueue(
+		"timesheet_management_system.utils.sharding.run_aggregate",
+		queue="long",
+		run=run,
+		aggregate=aggregate,
+		kwargs=kwargs,
+	)
+
+
+def run_aggregate(run, aggregate, kwargs):
+	keys = [f"{RESULT_KEY}|{run.run_id}|{shard}" for shard in range(run.shards)]
+	partials = [frappe.cache.get_value(key) or {} for key in keys]
+
+	run.elapsed = time.time() - run.started
+	run.timings = [
+		{
+			"shard": shard,
+			"employees": p.get("employees"),
+			"elapsed": p.get("elapsed"),
+			"failed": p.get("result") is None,
+		}
+		for shard, p in enumerate(partials)
+	]
+	failed = [t["shard"] for t in run.timings if t["failed"]]
+	if failed:
+		frappe.log_error(
+			title=f"{run.job}: aggregating without shards {', '.join(str(s + 1) for s in failed)}",
+			message=frappe.as_json(run),
+		)
+
+	with track(f"job.{run.job}.aggregate"):
+		frappe.get_attr(aggregate)([p.get("result") for p in partials], run, **kwargs)
+
+	# wall-clock time from fan-out to merged result, next to the per-shard histogram
+	record(f"job.{run.job}.total", time.time() - run.started, 0)
+	frappe.cache.hset(TIMINGS_KEY, run.job, run)
+	for key in keys:
+		frappe.cache.delete_value(key)
+	frappe.cache.delete(frappe.cache.make_key(f"{DONE_KEY}|{run.run_id}"))
+
+
+def get_last_run(job):
+	return frappe.cache.hget(TIMINGS_KEY, job)
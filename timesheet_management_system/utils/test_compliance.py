@@ -0,0 +1,53 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+from datetime import date
+
+from frappe.tests.utils import FrappeTestCase
+
+from timesheet_management_system.api.pending_report_delta import mask_to_dates
+from timesheet_management_system.utils.compliance import ComplianceMatrix
+
+# Monday to the Friday after next, so the bitmasks span more than one byte
+FROM_DATE = date(2025, 3, 3)
+TO_DATE = date(2025, 3, 14)
+HOLIDAY = date(2025, 3, 5)
+WORKING_DAYS = [date(2025, 3, d) for d in (3, 4, 6, 7, 10, 11, 12, 13, 14)]
+
+
+def make_matrix():
+	"""E1 filled every working day, E2 filled the first and was on leave the second, E3 filled nothing."""
+	matrix = ComplianceMatrix(FROM_DATE, TO_DATE, ["E1", "E2", "E3"])
+	matrix.working[(HOLIDAY - FROM_DATE).days] = False
+	matrix.filled[0] = matrix.working
+	matrix.filled[1, 0] = True
+	matrix.on_leave[1, 1] = True
+	return matrix
+
+
+class TestComplianceMatrix(FrappeTestCase):
+	def test_pending_dates_skip_weekends_holidays_and_filled_days(self):
+		pending = make_matrix().pending_dates()
+		self.assertEqual(list(pending), ["E2", "E3"])
+		self.assertEqual(pending["E2"], WORKING_DAYS[1:])
+		self.assertEqual(pending["E3"], WORKING_DAYS)
+
+	def test_pending_dates_can_excuse_leave(self):
+		pending = make_matrix().pending_dates(excuse_leave=True)
+		self.assertEqual(pending["E2"], WORKING_DAYS[2:])
+
+	def test_nothing_pending(self):
+		matrix = make_matrix()
+		matrix.filled[:] = True
+		self.assertEqual(matrix.pending_dates(), {})
+		self.assertEqual(matrix.pending_bitmasks(), {})
+
+	def test_bitmasks_round_trip_to_pending_dates(self):
+		matrix = make_matrix()
+		pending = matrix.pending_dates()
+		masks = matrix.pending_bitmasks()
+		self.assertEqual(set(masks), set(pending))
+		for employee, mask in masks.items():
+			self.assertEqual(
+				mask_to_dates(FROM_DATE, mask), [day.strftime("%Y-%m-%d") for day in pending[employee]]
+			)
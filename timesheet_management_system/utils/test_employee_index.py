@@ -0,0 +1,31 @@
+# Copyright (c) 2025, velmurugan Dharani and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from timesheet_management_system.utils.employee_index import EmployeeIndex
+
+
+def make_index(*employees):
+	return EmployeeIndex(
+		[frappe._dict(name=name, employee_name=employee_name) for name, employee_name in employees]
+	)
+
+
+class TestEmployeeIndex(FrappeTestCase):
+	def test_id_lookup_ignores_case_and_separators(self):
+		index = make_index(("HR-EMP-00001", "Jane Doe"))
+		self.assertEqual(index.get("hr-emp-00001").name, "HR-EMP-00001")
+		self.assertEqual(index.get("hremp00001").name, "HR-EMP-00001")
+
+	def test_colliding_ids_only_match_exactly(self):
+		index = make_index(("EMP-11-0", "First Person"), ("EMP-1-10", "Second Person"))
+		self.assertEqual(index.get("EMP-1-10").name, "EMP-1-10")
+		self.assertEqual(index.get("emp-11-0").name, "EMP-11-0")
+		self.assertIsNone(index.get("EMP110"))
+
+	def test_find_by_prefix_and_misspelling(self):
+		index = make_index(("E1", "Jane Doe"), ("E2", "John Smith"))
+		self.assertEqual([e.name for e in index.find("jo")], ["E2"])
+		self.assertEqual(index.find("Jhon Smith")[0].name, "E2")
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+import frappe
+from frappe.utils import getdate
+
+from timesheet_management_system.utils.cache import clear_now_and_after_commit
+from timesheet_management_system.utils.replica import primary
+
+CACHE_KEY = "timesheet_working_days"
+
+
+def get_year_bitmap(year, holiday_list=None):
+	"""Working days of `year` as an int bitset: bit n is set when Jan 1 + n days is a working day."""
+	return frappe.cache.hget(
+		CACHE_KEY,
+		f"{holiday_list or '*'}|{year}",
+		generator=lambda: build_year_bitmap_on_primary(year, holiday_list),
+	)
+
+
+def build_year_bitmap_on_primary(year, holiday_list=None):
+	with primary():
+		return build_year_bitmap(year, holiday_list)
+
+
+def build_year_bitmap(year, holiday_list=None):
+	start = date(year, 1, 1)
+	filters = {"holiday_date": ["between", [start, date(year, 12, 31)]]}
+	if holiday_list:
+		filters["parent"] = holiday_list
+
+	bits = 0
+	for offset in range((date(year + 1, 1, 1) - start).days):
+		if (start + timedelta(days=offset)).weekday() < 5:
+			bits |= 1 << offset
+
+	for holiday in frappe.get_all("Holiday", filters=filters, pluck="holiday_date"):
+		bits &= ~(1 << (holiday - start).days)
+
+	return bits
+
+
+def iter_year_ranges(from_date, to_date):
+	"""Split a date range into (year, first_offset, last_offset) pieces, one per calendar year."""
+	from_date, to_date = getdate(from_date), getdate(to_date)
+	for year in range(from_date.year, to_date.year + 1):
+		first = max(from_date, date(year, 1, 1))
+		last = min(to_date, date(year, 12, 31))
+		yield year, first.timetuple().tm_yday - 1, last.timetuple().tm_yday - 1
+
+
+def range_mask(first_offset, last_offset):
+	return ((1 << (last_offset - first_offset + 1)) - 1) << first_offset
+
+
+def is_working_day(day, holiday_list=None):
+	day = getdate(day)
+	return bool(get_year_bitmap(day.year, holiday_list) >> (day.timetuple().tm_yday - 1) & 1)
+
+
+def is_holiday(day, holiday_list=None):
+	"""A weekday that the holiday calendar takes off."""
+	day = getdate(day)
+	return day.weekday() < 5 and not is_working_day(day, holiday_list)
+
+
+def count_working_days(from_date, to_date, holiday_list=None):
+	return sum(
+		(get_year_bitmap(year, holiday_list) & range_mask(first, last)).bit_count()
+		for year, first, last in iter_year_ranges(from_date, to_date)
+	)
+
+
+def working_days_between(from_date, to_date, holiday_list=None):
+	"""Working days in [from_date, to_date], in order."""
+	days = []
+	for year, first, last in iter_year_ranges(from_date, to_date):
+		bits = get_year_bitmap(year, holiday_list) & range_mask(first, last)
+		start = date(year, 1, 1)
+		while bits:
+			lowest = bits & -bits
+			days.append(start + timedelta(days=lowest.bit_length() - 1))
+			bits ^= lowest
+	return days
+
+
+def clear_cache(doc=None, method=None):
+	clear_now_and_after_commit(lambda: frappe.cache.delete_value(CACHE_KEY))